@@ -0,0 +1,89 @@
+# Package Imports
+import pandas as pd
+import numpy as np
+import time
+from src.helper_methods import WordIndex, compare, compare_batch, filter_exclude, filter_exclude_at, filter_max_num_letter, filter_min_num_letter, get_knowns
+
+
+def filter_regex(knowns: dict, words: pd.DataFrame) -> pd.DataFrame:
+    # Regex/str.contains filter chain previously used by filter_words
+    filtered_words = words.filter(regex=''.join(knowns['exact']), axis=0)
+    filtered_words = filter_exclude(exclude=knowns['exclude'], words=filtered_words)
+    filtered_words = filter_exclude_at(exclude_at=knowns['exclude_at'], words=filtered_words, word_length=len(knowns['exact']))
+    filtered_words = filter_max_num_letter(max_num_letter=knowns['max_num_letter'], words=filtered_words)
+    filtered_words = filter_min_num_letter(min_num_letter=knowns['min_num_letter'], words=filtered_words)
+    return filtered_words
+
+def filter_index(knowns: dict, words: pd.DataFrame, index: WordIndex) -> pd.DataFrame:
+    return words[index.mask(knowns=knowns)]
+
+def get_states(words: list, num_states: int, seed: int=0, answers: list=None, guess_words: list=None) -> list:
+    # Random game states with one to three guesses (from guess_words) against a random answer (from answers)
+    rng = np.random.default_rng(seed)
+    answers = words if answers is None else answers
+    guess_words = words if guess_words is None else guess_words
+    states = []
+    for _ in range(num_states):
+        answer = answers[rng.integers(len(answers))]
+        guesses = {}
+        for guess in rng.choice(guess_words, size=rng.integers(1, 4), replace=False):
+            guesses[guess] = compare(guess=guess, actual=answer)
+        states.append(guesses)
+    return states
+
+
+def time_filters(df: pd.DataFrame, index: WordIndex, states: list, word_length: int) -> tuple:
+    # (regex ms/state, index ms/state), checking both filters keep the same words
+    knowns_list = [get_knowns(guesses=guesses, word_length=word_length) for guesses in states]
+
+    start = time.perf_counter()
+    regex_results = [filter_regex(knowns=knowns, words=df) for knowns in knowns_list]
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_results = [filter_index(knowns=knowns, words=df, index=index) for knowns in knowns_list]
+    index_time = time.perf_counter() - start
+
+    for regex_result, index_result in zip(regex_results, index_results):
+        assert list(regex_result.index) == list(index_result.index)
+    return regex_time*1000/len(states), index_time*1000/len(states)
+
+def time_feedback(guesses: list, index: WordIndex) -> float:
+    # ms to compute the feedback of each guess against every word
+    start = time.perf_counter()
+    compare_batch(guesses=guesses, actuals=index.letters)
+    return (time.perf_counter() - start)*1000/len(guesses)
+
+
+def main():
+    word_length = 5
+    num_states = 200
+
+    df = pd.read_csv('Data-Preprocessed/word_freq.csv').set_index('word')
+    words = list(df.index)
+
+    start = time.perf_counter()
+    index = WordIndex(words=df.index)
+    index_build = time.perf_counter() - start
+
+    # Words by their most repeated letter: distinct letters, double letters, triple letters
+    max_counts = index.counts.max(axis=1)
+    groups = {'distinct': [word for word, count in zip(words, max_counts) if count == 1],
+        'double': [word for word, count in zip(words, max_counts) if count == 2],
+        'triple': [word for word, count in zip(words, max_counts) if count >= 3]}
+    cases = {'random': get_states(words=words, num_states=num_states), 
+        'double letter answers': get_states(words=words, num_states=num_states, answers=groups['double']),
+        'triple letter answers': get_states(words=words, num_states=num_states, answers=groups['triple']),
+        'double letter guesses': get_states(words=words, num_states=num_states, guess_words=groups['double'])}
+
+    print(f'Words: {len(df)} ({", ".join(f"{len(group)} {name}" for name, group in groups.items())})\nStates: {num_states} per case')
+    print(f'Index build: {index_build*1000:.2f} ms')
+    for case, states in cases.items():
+        regex_time, index_time = time_filters(df=df, index=index, states=states, word_length=word_length)
+        print(f'{case}: regex filters {regex_time:.3f} ms/state, index filters {index_time:.3f} ms/state, speedup {regex_time/index_time:.1f}x')
+    for name, group in groups.items():
+        print(f'Feedback ({name} letter guesses): {time_feedback(guesses=group[:200], index=index):.3f} ms/guess')
+    return
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,177 @@
+# Package Imports
+import argparse
+import json
+import multiprocessing as mp
+import numpy as np
+import os
+import time
+from src.helper_methods import CompiledKnowns, SolverState, SubsetCache, WordIndex, add_known_info, bucket_sizes, compare, expected_information, get_knowns, load_pattern_matrix, load_word_table, load_words
+
+MAX_GUESSES = 6
+GIVE_UP_GUESSES = 20
+
+# Worker globals, set by init_worker
+WORDS = None
+INDEX = None
+PATTERNS = None
+RANKS = None
+CHOICES = None
+
+
+def init_worker(datapath: str, cache_mb: float) -> None:
+    global WORDS, INDEX, PATTERNS, RANKS, CHOICES
+    WORDS = load_words(path=datapath)
+    INDEX = WordIndex(words=WORDS.index)
+    PATTERNS = load_word_table(path=datapath)['patterns'] if datapath.endswith('.bin') else None
+    if PATTERNS is None:
+        PATTERNS = load_pattern_matrix(words=list(WORDS.index))
+    # Same order main.suggest displays: by column (high to low), ties by word frequency
+    RANKS = {}
+    for col in ['wordFreq', 'letterFreqSum', 'letterPosFreqSum']:
+        order = np.lexsort((-WORDS['wordFreq'].values, -WORDS[col].values))
+        RANKS[col] = np.empty(len(order), dtype=np.int64)
+        RANKS[col][order] = np.arange(len(order))
+    CHOICES = {strategy: SubsetCache(num_words=len(WORDS), max_bytes=int(cache_mb * 2**20)) for strategy in STRATEGIES}
+
+def prepare_pattern_matrix(datapath: str) -> None:
+    # Build and save the pattern matrix once in the parent, so pool workers only load it
+    if not datapath.endswith('.bin'):
+        load_pattern_matrix(words=list(load_words(path=datapath).index))
+
+def pattern_sizes(candidates: np.ndarray, guesses: np.ndarray) -> np.ndarray:
+    return bucket_sizes(patterns=PATTERNS[np.ix_(guesses, candidates)], word_length=INDEX.letters.shape[1])
+
+# Each strategy picks one of guesses (positions in WORDS) given the remaining candidates, 
+# ties going to guesses that are candidates themselves
+def column_strategy(col: str):
+    # Column scores say nothing about the remaining words, so the best ranked candidate is guessed whenever guesses include one
+    def strategy(candidates: np.ndarray, guesses: np.ndarray) -> int:
+        return guesses[np.lexsort((RANKS[col][guesses], ~np.isin(guesses, candidates)))[0]]
+    return strategy
+
+def elr_strategy(candidates: np.ndarray, guesses: np.ndarray) -> int:
+    # Highest ELR is the lowest sum of squared bucket sizes
+    sums = (pattern_sizes(candidates=candidates, guesses=guesses)**2).sum(axis=1)
+    return guesses[np.lexsort((~np.isin(guesses, candidates), sums))[0]]
+
+def entropy_strategy(candidates: np.ndarray, guesses: np.ndarray) -> int:
+    information = expected_information(sizes=pattern_sizes(candidates=candidates, guesses=guesses))
+    return guesses[np.lexsort((~np.isin(guesses, candidates), -information))[0]]
+
+def worst_case_strategy(candidates: np.ndarray, guesses: np.ndarray) -> int:
+    # Smallest largest bucket, ties by most buckets
+    sizes = pattern_sizes(candidates=candidates, guesses=guesses)
+    return guesses[np.lexsort((~np.isin(guesses, candidates), -(sizes > 0).sum(axis=1), sizes.max(axis=1)))[0]]
+
+STRATEGIES = {
+    'wordFreq': column_strategy('wordFreq'),
+    'letterFreqSum': column_strategy('letterFreqSum'),
+    'letterPosFreqSum': column_strategy('letterPosFreqSum'),
+    'ELR': elr_strategy,
+    'entropy': entropy_strategy,
+    'worstCase': worst_case_strategy,
+}
+
+def choose_guess(strategy: str, candidates: np.ndarray, guesses: np.ndarray) -> int:
+    # Games share openers and common states, so each (candidates, guesses) pair is scored once per worker
+    key = CHOICES[strategy].key(candidates=candidates) + CHOICES[strategy].key(candidates=guesses)
+    guess = CHOICES[strategy].get(key)
+    if guess is None:
+        guess = STRATEGIES[strategy](candidates, guesses)
+        CHOICES[strategy].put(key, guess)
+    return guess
+
+def play(args: tuple) -> tuple:
+    # guess_mode: 'candidates' (guess only words that can be the answer), 
+    # 'hard' (any word using every revealed hint, hard mode), or 'all' (any word)
+    answer, strategy, guess_mode = args
+    state = SolverState(words=WORDS, index=INDEX)
+    knowns = get_knowns(guesses={}, word_length=INDEX.letters.shape[1])
+    legal = np.arange(len(WORDS))
+    latencies = []
+    guess = None
+    while guess != answer and len(state.guesses) < GIVE_UP_GUESSES:
+        start = time.perf_counter()
+        candidates = state.candidates[-1]
+        if guess_mode == 'hard' and state.guesses:
+            # Knowns only get stricter, so only the previous legal guesses need checking
+            legal, _ = CompiledKnowns(knowns=knowns).evaluate(index=INDEX, rows=legal)
+        guesses = {'candidates': candidates, 'hard': legal, 'all': legal}[guess_mode]
+        if guess_mode != 'candidates' and state.guesses:
+            # Words already guessed are still legal but tell nothing new
+            guesses = np.setdiff1d(guesses, INDEX.words.get_indexer([word for word, _ in state.guesses]), assume_unique=True)
+        guess = WORDS.index[choose_guess(strategy=strategy, candidates=candidates, guesses=guesses)]
+        result = compare(guess=guess, actual=answer)
+        state.add_guess(guess=guess, result=result)
+        if guess_mode == 'hard':
+            knowns = add_known_info(guess=guess, result=result, knowns=knowns)
+        latencies.append(time.perf_counter() - start)
+    return answer, len(state.guesses), guess == answer, latencies, (os.getpid(), CHOICES[strategy].stats()), state.guesses
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Play every word in the words list as the hidden answer and report solver quality and speed.')
+    parser.add_argument('--strategy', default='letterFreqSum', choices=list(STRATEGIES), help='Guess selection strategy. (Defaults to letterFreqSum)')
+    parser.add_argument('--datapath', default='Data-Preprocessed/word_freq.csv', help='Words table, .csv or packed .bin. (Defaults to Data-Preprocessed/word_freq.csv)')
+    parser.add_argument('--processes', type=int, default=mp.cpu_count(), help='Worker processes. (Defaults to number of cores)')
+    parser.add_argument('--cache-mb', type=float, default=64, help='Memory limit of each process\'s candidate subset cache in MB. (Defaults to 64)')
+    parser.add_argument('--limit', type=int, default=None, help='Only play the first LIMIT answers.')
+    parser.add_argument('--hard-mode', action='store_true', help='Play in hard mode: guesses may be any word that uses every revealed hint.')
+    parser.add_argument('--all-guesses', action='store_true', help='Guesses may be any word, including words that cannot be the answer (hard mode off).')
+    parser.add_argument('--worst', type=int, default=10, help='Number of answers taking the most guesses to report. (Defaults to 10)')
+    parser.add_argument('--output', default=None, help='Results file. (Defaults to benchmark_<strategy>.json, benchmark_<strategy>_hard.json in hard mode, etc.)')
+    args = parser.parse_args()
+    guess_mode = 'hard' if args.hard_mode else 'all' if args.all_guesses else 'candidates'
+    output = args.output or f'benchmark_{args.strategy}{"" if guess_mode == "candidates" else "_" + guess_mode}.json'
+
+    start = time.time()
+    answers = list(load_words(path=args.datapath).index)[:args.limit]
+    tasks = [(answer, args.strategy, guess_mode) for answer in answers]
+    if args.processes > 1:
+        prepare_pattern_matrix(datapath=args.datapath)
+        with mp.Pool(processes=args.processes, initializer=init_worker, initargs=(args.datapath, args.cache_mb)) as pool:
+            games = list(pool.imap_unordered(play, tasks, chunksize=16))
+    else:
+        init_worker(datapath=args.datapath, cache_mb=args.cache_mb)
+        games = [play(task) for task in tasks]
+    wall_time = time.time() - start
+
+    num_guesses = np.array([game[1] for game in games])
+    failed = np.array([(not game[2]) or game[1] > MAX_GUESSES for game in games])
+    latencies = np.array([latency for game in games for latency in game[3]]) * 1000
+    # Latest cache counters of each worker, summed
+    cache_stats = {}
+    for pid, stats in dict(game[4] for game in games).items():
+        for name in ['hits', 'misses', 'evictions', 'entries', 'bytes']:
+            cache_stats[name] = cache_stats.get(name, 0) + stats[name]
+    cache_stats['hitRate'] = cache_stats['hits'] / max(cache_stats['hits'] + cache_stats['misses'], 1)
+    results = {
+        'strategy': args.strategy,
+        'guessMode': guess_mode,
+        'datapath': args.datapath,
+        'games': len(games),
+        'processes': args.processes,
+        'averageGuesses': float(num_guesses.mean()),
+        'failureRate': float(failed.mean()),
+        'guessDistribution': {str(n): int((num_guesses == n).sum()) for n in range(1, num_guesses.max() + 1)},
+        'guessLatencyMs': {f'p{p}': float(np.percentile(latencies, p)) for p in [50, 90, 99]},
+        'wallSeconds': wall_time,
+        'cache': cache_stats,
+        # Answers taking the most guesses, ties alphabetical
+        'worstAnswers': {game[0]: game[1] for game in sorted(games, key=lambda game: (-game[1], game[0]))[:args.worst]},
+        'guesses': {game[0]: game[1] for game in sorted(games)},
+    }
+    results['guessLatencyMs']['max'] = float(latencies.max())
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2)
+
+    print(f'Strategy: {args.strategy} ({guess_mode} guesses)\nGames: {len(games)}')
+    print(f'Average Guesses: {results["averageGuesses"]:.4f}\nFailure Rate: {results["failureRate"]*100:.2f}%')
+    print(f'Worst Answers: {results["worstAnswers"]}')
+    print(f'Guess Latency (ms): {results["guessLatencyMs"]}')
+    print(f'Cache: {cache_stats}')
+    print(f'Seconds Elapsed: {wall_time:.2f}\nSaved: {output}')
+    return
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,41 @@
+# Package Imports
+import argparse
+import numpy as np
+import os
+import time
+from src.helper_methods import WORD_TABLE_PATH, load_pattern_matrix, load_word_table, load_words, save_word_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Convert a preprocessed words CSV to a packed, memory-mappable word table.')
+    parser.add_argument('--csv', default='Data-Preprocessed/word_freq.csv', help='Preprocessed words CSV. (Defaults to Data-Preprocessed/word_freq.csv)')
+    parser.add_argument('--output', default=WORD_TABLE_PATH, help=f'Word table to write. (Defaults to {WORD_TABLE_PATH})')
+    parser.add_argument('--patterns', action='store_true', help='Include the feedback pattern matrix.')
+    args = parser.parse_args()
+    start = time.time()
+
+    # Sorted the way load_word_data orders the words, so it can use the mapped arrays as they are
+    raw = load_words(path=args.csv)
+    df = raw.sort_values(by='wordFreq', ascending=False, kind='mergesort')
+    patterns = None
+    if args.patterns:
+        order = raw.index.get_indexer(df.index)
+        patterns = load_pattern_matrix(words=list(raw.index))[np.ix_(order, order)]
+    save_word_table(words=df, path=args.output, patterns=patterns)
+
+    # Check the round trip
+    load_start = time.time()
+    table = load_word_table(path=args.output)
+    load_time = time.time() - load_start
+    load_word_table(path=args.output, verify=True)
+    assert load_words(path=args.output).equals(df)
+    if patterns is not None:
+        assert (table['patterns'] == patterns).all()
+
+    print(f'Words: {len(df)}\nColumns: {list(df.columns)}\nPatterns: {patterns is not None}')
+    print(f'Saved: {args.output} ({os.path.getsize(args.output)/1e6:.2f} MB)')
+    print(f'Load Time: {load_time*1000:.2f} ms\nSeconds Elapsed: {time.time()-start:.2f}')
+    return
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,75 @@
+# Package Imports
+import argparse
+import asyncio
+import json
+import numpy as np
+import time
+from src.helper_methods import compare, load_words
+
+
+def get_states(words: list, num_states: int, seed: int=0) -> list:
+    # Random game states with zero to three guesses against a random answer
+    rng = np.random.default_rng(seed)
+    states = []
+    for _ in range(num_states):
+        answer = words[rng.integers(len(words))]
+        guesses = rng.choice(words, size=rng.integers(0, 4), replace=False)
+        states.append({'guesses': {guess: compare(guess=guess, actual=answer) for guess in guesses}})
+    return states
+
+async def client(host: str, port: int, endpoint: str, bodies: list, latencies: list, errors: list) -> None:
+    # One keep-alive connection sending its requests one after another
+    reader, writer = await asyncio.open_connection(host=host, port=port)
+    for body in bodies:
+        payload = json.dumps(body).encode()
+        start = time.perf_counter()
+        writer.write(f'POST /{endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n\r\n'.encode() + payload)
+        await writer.drain()
+        status = (await reader.readline()).split()[1]
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        await reader.readexactly(int(headers['content-length']))
+        latencies.append(time.perf_counter() - start)
+        if status != b'200':
+            errors.append(status)
+    writer.close()
+
+async def run(args: argparse.Namespace, states: list) -> tuple:
+    if args.endpoint == 'batch':
+        bodies = [{'requests': [dict(state, endpoint='suggest', sort_by=args.sort_by) for state in states[i:i+args.batch_size]]}
+            for i in range(0, len(states), args.batch_size)]
+    else:
+        bodies = [dict(state, sort_by=args.sort_by) for state in states]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*[client(host=args.host, port=args.port, endpoint=args.endpoint, bodies=bodies[i::args.concurrency], latencies=latencies, errors=errors)
+        for i in range(args.concurrency)])
+    return time.perf_counter() - start, np.array(latencies), errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test a running solver service (server.py).')
+    parser.add_argument('--host', default='127.0.0.1', help='Service host. (Defaults to 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Service port. (Defaults to 8000)')
+    parser.add_argument('--endpoint', default='suggest', choices=['filter', 'suggest', 'score', 'batch'], help='Endpoint to call. (Defaults to suggest)')
+    parser.add_argument('--sort-by', default='Letter Frequency', help='sort_by sent with each game state. (Defaults to Letter Frequency)')
+    parser.add_argument('--requests', type=int, default=2000, help='Game states to send. (Defaults to 2000)')
+    parser.add_argument('--batch-size', type=int, default=100, help='Game states per /batch request. (Defaults to 100)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent connections. (Defaults to 16)')
+    parser.add_argument('--datapath', default='Data-Preprocessed/word_freq.csv', help='Words list used to generate game states. (Defaults to Data-Preprocessed/word_freq.csv)')
+    args = parser.parse_args()
+
+    states = get_states(words=list(load_words(path=args.datapath).index), num_states=args.requests)
+    elapsed, latencies, errors = asyncio.run(run(args=args, states=states))
+    print(f'Endpoint: /{args.endpoint} ({args.sort_by})\nRequests: {len(latencies)} ({len(states)} game states)\nErrors: {len(errors)}')
+    print(f'Requests/s: {len(latencies)/elapsed:.1f}\nGame States/s: {len(states)/elapsed:.1f}')
+    print(f'Latency (ms): p50 {np.percentile(latencies, 50)*1000:.2f}, p90 {np.percentile(latencies, 90)*1000:.2f}, p99 {np.percentile(latencies, 99)*1000:.2f}')
+    return
+
+if __name__=='__main__':
+    main()
@@ -1,87 +1,124 @@
 # Package Imports
+import argparse
 import pandas as pd
+import numpy as np
 import re
 import time
-from string import ascii_uppercase
-
-
-def get_counts(letters: list, positions: list, df: pd.DataFrame) -> pd.DataFrame:
-    tracker = pd.DataFrame(columns=['letter', 'position', 'letterPosFreq'])
-    for letter in letters:
-        for position in positions:
-            # Generate regex
-            regex = list('.'*len(positions))
-            regex[position] = letter
-            regex = ''.join(regex)
-            # Calculate and record
-            tracker = pd.concat([tracker, pd.DataFrame(data={'letter': letter, 'position': position, 'letterPosFreq': len(df[df['word'].str.match(regex)])}, index=[0])], ignore_index=True)
-    return tracker.set_index(['letter', 'position'])
-
-def get_letter_pos_freq_sum(word: list, letter_pos_freq: pd.DataFrame) -> int:
-    a = 0
-    for i in range(len(word)):
-        letter = word[i]
-        a += letter_pos_freq.loc[letter, i]['letterPosFreq']
-    return a
+from src.helper_methods import encode_words
+
+
+def get_counts(letters: np.ndarray) -> np.ndarray:
+    # Number of words with each letter (rows, 'A' -> 0) at each position (columns)
+    counts = np.zeros((26, letters.shape[1]), dtype=np.int64)
+    for position in range(letters.shape[1]):
+        counts[:, position] = np.bincount(letters[:, position], minlength=26)
+    return counts
+
+def get_letter_freq_sums(letters: np.ndarray, letter_pos_freq: np.ndarray) -> tuple:
+    # Sum of letter frequencies over the distinct letters in each word and sum of letter at position frequencies
+    letter_freq = letter_pos_freq.sum(axis=1)
+    presence = np.zeros((len(letters), 26), dtype=bool)
+    presence[np.arange(len(letters))[:, None], letters] = True
+    letter_freq_sum = presence.astype(np.int64) @ letter_freq
+    letter_pos_freq_sum = letter_pos_freq[letters, np.arange(letters.shape[1])].sum(axis=1)
+    return letter_freq_sum, letter_pos_freq_sum
+
+def stream_freq(path: str, allowed: pd.Index, chunk_size: int, sep: str=',', word_col: str='word', freq_col: str='count') -> np.ndarray:
+    # Frequency of each allowed word summed over a word/count file of any size, read chunk by chunk so memory stays bounded
+    # Only the cheap length check runs on every row; the rest are upper-cased and looked up in allowed's hash table
+    freqs = np.zeros(len(allowed), dtype=np.int64)
+    word_length = len(allowed[0])
+    for chunk in pd.read_csv(path, sep=sep, usecols=[word_col, freq_col], chunksize=chunk_size, dtype={word_col: str}, keep_default_na=False):
+        mask = (chunk[word_col].str.len() == word_length).values
+        positions = allowed.get_indexer(pd.Series(chunk[word_col].values[mask], dtype=str).str.upper())
+        found = positions >= 0
+        np.add.at(freqs, positions[found], chunk[freq_col].values[mask][found].astype(np.int64))
+    return freqs
+
+def get_peak_rss_mb() -> float:
+    # Peak resident set size of this process (ru_maxrss is in KB on Linux), None where the resource module is unavailable (Windows)
+    try:
+        import resource
+    except ImportError:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
 
 def get_time() -> str:
     return time.strftime("%H:%M:%S", time.gmtime(time.time()))
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Build the words table (frequencies and letter frequency sums) for one word length.')
+    parser.add_argument('--word-length', type=int, default=5, help='Length of words. (Defaults to 5)')
+    parser.add_argument('--words', default='Data-Original/wordle_words_04_15_22.txt', 
+        help='Allowed words, separated by spaces, commas or new lines. (Defaults to Data-Original/wordle_words_04_15_22.txt)')
+    parser.add_argument('--corpus', action='append', default=[], 
+        help='Extra word/count frequency file (csv, may be compressed) whose counts are added to the Kaggle counts. Can be given more than once.')
+    parser.add_argument('--corpus-sep', default=',', help='Column separator of the --corpus files. (Defaults to ,)')
+    parser.add_argument('--chunk-size', type=int, default=100000, help='Rows read at a time from frequency files. (Defaults to 100000)')
+    parser.add_argument('--output', default=None, help='Words table file. (Defaults to Data-Preprocessed/word_freq.csv, word_freq_<length>.csv for other lengths)')
+    args = parser.parse_args()
     times = {'start': get_time()}
+    stage_start = time.perf_counter()
     print(f'pandas: {pd.__version__}')
     print(f're: {re.__version__}')
 
     # Global Variables
-    WORD_LENGTH = 5
+    WORD_LENGTH = args.word_length
+    output = args.output or ('Data-Preprocessed/word_freq.csv' if WORD_LENGTH == 5 else f'Data-Preprocessed/word_freq_{WORD_LENGTH}.csv')
 
     # List of Wordle Words
-    with open('Data-Original/wordle_words_04_15_22.txt', 'r') as file:
-        wordle_words = file.read().replace('\n', '').replace('"', '').replace(',', '').upper().split(' ')
+    with open(args.words, 'r') as file:
+        wordle_words = re.split(r'[\s,]+', file.read().replace('"', '').upper().strip())
+    wordle_words = list(dict.fromkeys(word for word in wordle_words if len(word) == WORD_LENGTH and word.isalpha()))
     df = pd.DataFrame(data={'word': wordle_words,'wordFreq': [0]*len(wordle_words)}).set_index('word')
     print(f'# Wordle Words: {len(df)}')
+    times['wordleWords'] = time.perf_counter() - stage_start
+    stage_start = time.perf_counter()
 
-    # Kaggle Dataset
-    kaggle = pd.read_csv('Data-Original/unigram_freq.csv')
-    kaggle['word'] = kaggle['word'].astype('str').str.upper()
-    # Correct length and is a Wordle word
-    mask = kaggle['word'].apply(lambda x: (len(x) == WORD_LENGTH) & (x in df.index))
-    kaggle = kaggle[mask]
-    kaggle = kaggle.rename(columns={'count':'wordFreq'})
-    kaggle = kaggle.set_index('word')
-    print(f'# Kaggle Words: {len(df)}')
-    df.update(other=kaggle, join='left', overwrite=True)
+    # Kaggle Dataset and any extra corpora, streamed
+    freqs = stream_freq(path='Data-Original/unigram_freq.csv', allowed=df.index, chunk_size=args.chunk_size)
+    print(f'# Kaggle Words: {(freqs > 0).sum()}')
+    for path in args.corpus:
+        freqs += stream_freq(path=path, allowed=df.index, chunk_size=args.chunk_size, sep=args.corpus_sep)
+        print(f'# Words with Frequency after {path}: {(freqs > 0).sum()}')
+    df['wordFreq'] = freqs.astype(float)
+    times['kaggle'] = time.perf_counter() - stage_start
+    stage_start = time.perf_counter()
 
     # wordfrequency.info Dataset
     word_freq = pd.read_excel('Data-Original/lemmas_60k_words.xlsx')
     word_freq = pd.DataFrame(data={'wordFreq': word_freq['wordFreq'].astype('int'), 'word': word_freq['word'].astype('str').str.upper()})
     # Remove punctuation
-    word_freq['word'] = word_freq['word'].apply(lambda x: re.sub(r'[^\w\s]', '', x))
+    word_freq['word'] = word_freq['word'].str.replace(r'[^\w\s]', '', regex=True)
     # Correct length and is a Wordle word
-    mask = word_freq['word'].apply(lambda x: (len(x) == WORD_LENGTH) & (x in df.index)).values
+    mask = ((word_freq['word'].str.len() == WORD_LENGTH) & word_freq['word'].isin(df.index)).values
     word_freq = word_freq[mask]
     # Also want word to not have frequency from Kaggle dataset
-    mask = word_freq['word'].apply(lambda x: df.loc[x] == 0).values
+    mask = (df.loc[word_freq['word'], 'wordFreq'] == 0).values
     word_freq = word_freq[mask].set_index('word')
     print(f'# word_freq Words: {len(word_freq)}')
     df.update(other=word_freq, join='left', overwrite=True)
     df = df.reset_index()
-    times['wordFreq'] = get_time()
+    times['wordFreqInfo'] = time.perf_counter() - stage_start
+    stage_start = time.perf_counter()
 
     # Compute sum of letter frequency and sum of letter position frequency
-    letter_pos_freq = get_counts(letters=list(ascii_uppercase), positions=[0,1,2,3,4], df=df)
-    letter_freq = letter_pos_freq.reset_index().drop('position', axis=1).groupby('letter').sum().sort_values(by='letterPosFreq', ascending=False).rename(columns={'letterPosFreq':'letterFreq'})
-    df['letterFreqSum'] = df['word'].apply(lambda x: sum([letter_freq.loc[letter, 'letterFreq'] for letter in set(x)]))
-    df['letterPosFreqSum'] = df['word'].apply(lambda x: get_letter_pos_freq_sum(word=x, letter_pos_freq=letter_pos_freq))
+    letters = encode_words(df['word'])
+    letter_pos_freq = get_counts(letters=letters)
+    df['letterFreqSum'], df['letterPosFreqSum'] = get_letter_freq_sums(letters=letters, letter_pos_freq=letter_pos_freq)
+    times['letterFreq'] = time.perf_counter() - stage_start
+    stage_start = time.perf_counter()
 
     # Save Preprocessed Data
-    df.to_csv('Data-Preprocessed/word_freq.csv', index=False)
+    df.to_csv(output, index=False)
+    times['save'] = time.perf_counter() - stage_start
 
     # Print Time
     times['end']= get_time()
+    times['peakRssMB'] = get_peak_rss_mb()
     print(f'Times:\n{times}')
     return
 
 if __name__=='__main__':
-    main()
\ No newline at end of file
+    main()
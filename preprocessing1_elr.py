@@ -1,55 +1,160 @@
 # Package Imports
-import pandas as pd
+import argparse
 import numpy as np
+import os
+import sys
 import time
 import multiprocessing as mp
-from src.helper_methods import filter_words, compare # elr
-
-
-def elr_multiprocess(words: pd.DataFrame, idx0: int, idx1: int, word_legnth: int, q: mp.Queue) -> pd.DataFrame:
-    # Iterate over all potential guesses
-    for guess in words.index[idx0:idx1]:
-        # Iterate over all potential Wordle words
-        for potential_wordle_word in words.index:
-            if guess != potential_wordle_word:
-                guesses = {guess: compare(guess=guess, actual=potential_wordle_word)}
-                filtered_words = filter_words(guesses=guesses, words=words, remove_previous_wordle_words=False, word_length=word_legnth)
-                words.loc[guess, 'ELR'] += len(filtered_words)
-    q.put(words.iloc[idx0:idx1])
-    return
+from multiprocessing import shared_memory
+from src.helper_methods import bucket_sizes, compare_batch, encode_words, letter_counts, load_words, pattern_matrix, update_bucket_sizes
+from src import profiling
+
+CHECKPOINT_PATH = 'Data-Preprocessed/word_elr_checkpoint.npz'
+OUTPUT_PATH = 'Data-Preprocessed/word_elr.csv'
+HISTOGRAMS_PATH = 'Data-Preprocessed/word_elr_histograms.npz'
+
+# Worker globals, set by init_worker
+SHARED = None
+LETTERS = None
+COUNTS = None
+REPEATS = None
+
+
+def init_worker(shm_name: str, shape: tuple) -> None:
+    # Attach to the encoded words matrix instead of receiving a pickled copy
+    global SHARED, LETTERS, COUNTS, REPEATS
+    SHARED = shared_memory.SharedMemory(name=shm_name)
+    LETTERS = np.ndarray(shape, dtype=np.uint8, buffer=SHARED.buf)
+    # Letter counts and repeated letter flags once per worker instead of once per batch
+    COUNTS = letter_counts(LETTERS)
+    REPEATS = COUNTS.max(axis=1, initial=0) > 1
+
+def elr_batch(batch: tuple) -> tuple:
+    # Feedback pattern bucket sizes (filtered list lengths) over all potential Wordle words for guesses [start, stop)
+    start, stop = batch
+    patterns = compare_batch(guesses=LETTERS[start:stop], actuals=LETTERS, guess_repeats=REPEATS[start:stop], actual_counts=COUNTS)
+    sizes = bucket_sizes(patterns=patterns, word_length=LETTERS.shape[1])
+    # Profiling stats (WORDLER_PROFILE=1) are sent back with each batch and merged by the parent
+    return start, stop, sizes.astype(np.int32), profiling.collect()
+
+def load_checkpoint(words: list, num_patterns: int, path: str) -> dict:
+    # {'sizes', 'done'} arrays over words
+    if os.path.exists(path):
+        with np.load(path) as saved:
+            if list(saved['words']) == words and 'sizes' in saved:
+                return {name: saved[name] for name in ['sizes', 'done']}
+    return {'sizes': np.zeros((len(words), num_patterns), dtype=np.int32), 'done': np.zeros(len(words), dtype=bool)}
+
+def save_checkpoint(words: list, results: dict, path: str) -> None:
+    np.savez(path, words=np.array(words), **results)
+
+def load_histograms(path: str) -> tuple:
+    # (words, bucket sizes) saved by the last run, (None, None) if missing
+    if not os.path.exists(path):
+        return None, None
+    with np.load(path) as saved:
+        return list(saved['words']), saved['sizes']
+
+def save_histograms(words: list, sizes: np.ndarray, path: str) -> None:
+    np.savez_compressed(path, words=np.array(words), sizes=sizes)
+
+def compute_sizes(words: list, args: argparse.Namespace) -> np.ndarray:
+    # Bucket sizes of every word over every word, in parallel and resumable from the checkpoint
+    letters = encode_words(words)
+    results = load_checkpoint(words=words, num_patterns=3**letters.shape[1], path=args.checkpoint)
+    done = results['done']
+    if done.any():
+        print(f'Resuming: {done.sum()} words already computed')
+    batches = [(i, min(i+args.batch_size, len(words))) for i in range(0, len(words), args.batch_size) if not done[i:i+args.batch_size].all()]
+
+    shared = shared_memory.SharedMemory(create=True, size=max(letters.nbytes, 1))
+    try:
+        np.ndarray(letters.shape, dtype=np.uint8, buffer=shared.buf)[:] = letters
+        with mp.Pool(processes=args.processes, initializer=init_worker, initargs=(shared.name, letters.shape)) as pool:
+            last_checkpoint = last_report = run_start = time.time()
+            num_computed = 0
+            for batch_start, batch_stop, batch_sizes, batch_stats in pool.imap_unordered(elr_batch, batches):
+                profiling.merge(stats=batch_stats)
+                results['sizes'][batch_start:batch_stop] = batch_sizes
+                done[batch_start:batch_stop] = True
+                num_computed += batch_stop - batch_start
+                now = time.time()
+                if now - last_checkpoint >= args.checkpoint_seconds:
+                    save_checkpoint(words=words, results=results, path=args.checkpoint)
+                    last_checkpoint = now
+                if now - last_report >= 1 or done.all():
+                    print(f'Progress: {done.sum()}/{len(words)} words ({num_computed/max(now-run_start, 1e-9):.1f} words/s)')
+                    last_report = now
+    except KeyboardInterrupt:
+        save_checkpoint(words=words, results=results, path=args.checkpoint)
+        print(f'Interrupted: {done.sum()}/{len(words)} words saved to {args.checkpoint}')
+        raise
+    finally:
+        shared.close()
+        shared.unlink()
+    return results['sizes']
+
 
 def main():
+    parser = argparse.ArgumentParser(description='Compute the Expected List Reduction and worst case of every word in word_freq.csv.')
+    parser.add_argument('--datapath', default='Data-Preprocessed/word_freq.csv', help='Words table, .csv or packed .bin. (Defaults to Data-Preprocessed/word_freq.csv)')
+    parser.add_argument('--processes', type=int, default=mp.cpu_count(), help='Worker processes. (Defaults to number of cores)')
+    parser.add_argument('--batch-size', type=int, default=32, help='Guesses per work item. (Defaults to 32)')
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH, help=f'Partial results file used to resume an interrupted run. (Defaults to {CHECKPOINT_PATH})')
+    parser.add_argument('--checkpoint-seconds', type=float, default=10.0, help='Seconds between checkpoint saves. (Defaults to 10)')
+    parser.add_argument('--output', default=None, help=f'Words table with the ELR columns. (Defaults to {OUTPUT_PATH}, word_elr_<length>.csv for other lengths)')
+    parser.add_argument('--histograms', default=None, 
+        help=f'Bucket sizes of every word saved by each run. (Defaults to {HISTOGRAMS_PATH}, word_elr_histograms_<length>.npz for other lengths)')
+    parser.add_argument('--incremental', action='store_true',
+        help='Update the saved bucket sizes for the words added to and removed from the words table since the last run instead of recomputing them all.')
+    parser.add_argument('--verify', action='store_true', help='Also recompute everything from scratch and check the results match.')
+    args = parser.parse_args()
     start = time.time()
-    num_words = 10
 
-    df = pd.read_csv('Data-Preprocessed/word_freq.csv').set_index('word')
-    df['ELR'] = 1.0
-    # df = df.iloc[:num_words]
+    df = load_words(path=args.datapath)
+    words = list(df.index)
     print(f'Original Length: {len(df)}')
-    num_cores = mp.cpu_count()
-    print(f'Number of Cores: {num_cores}')
-    chunk_size = int(np.ceil(len(df) / num_cores))
-    print(f'Chunk Size: {chunk_size}')
-    queues = [mp.Queue() for i in range(num_cores)]
-    processes = [mp.Process(target=elr_multiprocess, args=(df, i*chunk_size, (i+1)*chunk_size, 5, queues[i])) for i in range(num_cores)]
-    for p in processes:
-        p.start()
-    for p in processes:
-        p.join() 
-    results = []
-    for q in queues:
-        results.append(q.get())
-    df = pd.concat(results, axis=0)
+    print(f'Number of Processes: {args.processes}')
+    word_length = len(words[0])
+    output = args.output or (OUTPUT_PATH if word_length == 5 else OUTPUT_PATH.replace('.csv', f'_{word_length}.csv'))
+    args.histograms = args.histograms or (HISTOGRAMS_PATH if word_length == 5 else HISTOGRAMS_PATH.replace('.npz', f'_{word_length}.npz'))
+
+    saved_words, saved_sizes = load_histograms(path=args.histograms) if args.incremental else (None, None)
+    if saved_words and len(saved_words[0]) == word_length:
+        num_added, num_removed = len(set(words) - set(saved_words)), len(set(saved_words) - set(words))
+        print(f'Incremental: {num_added} words added, {num_removed} words removed since the last run')
+        sizes = update_bucket_sizes(sizes=saved_sizes, old_words=saved_words, new_words=words)
+    else:
+        if args.incremental:
+            print(f'Incremental: no saved bucket sizes for {word_length} letter words in {args.histograms}, computing all of them')
+        sizes = compute_sizes(words=words, args=args)
+    update_end = time.time()
+
+    if args.verify:
+        full_sizes = bucket_sizes(patterns=pattern_matrix(words=words), word_length=word_length)
+        if not (full_sizes == sizes).all():
+            print(f'Verify: FAILED, bucket sizes of {(full_sizes != sizes).any(axis=1).sum()} words differ from a full recompute')
+            sys.exit(1)
+        print(f'Verify: bucket sizes of all {len(words)} words match a full recompute ({time.time()-update_end:.2f}s)')
+
+    # Same definition as helper_methods.elr
+    df['ELR'] = (sizes.astype(np.int64)**2).sum(axis=1).astype(float)
     df['ELR'] = 1 - (df['ELR'] / len(df)**2)
+    # Most words that can remain after the guess and number of distinct responses
+    df['worstCase'] = sizes.max(axis=1)
+    df['bucketCount'] = (sizes > 0).sum(axis=1)
     print(df.head())
 
     # Save Data
-    df.reset_index().to_csv('Data-Preprocessed/word_elr.csv', index=False)
+    df.reset_index().to_csv(output, index=False)
+    save_histograms(words=words, sizes=sizes, path=args.histograms)
+    if os.path.exists(args.checkpoint):
+        os.remove(args.checkpoint)
 
     # Print Time
     end = time.time()
-    print(f'Words: {len(df)}\nSeconds Elapsed: {end-start}')
+    print(f'Saved: {output}\nWords: {len(df)}\nUpdate Seconds: {update_end-start:.2f}\nSeconds Elapsed: {end-start}')
     return
 
 if __name__=='__main__':
-    main()
\ No newline at end of file
+    main()
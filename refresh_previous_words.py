@@ -0,0 +1,42 @@
+# Package Imports
+import argparse
+import datetime
+import pandas as pd
+from src.helper_methods import PREVIOUS_WORDS_PATH, load_words, read_word_list, save_previous_words
+
+PREVIOUS_WORDS_URL = 'https://raw.githubusercontent.com/eagerterrier/previous-wordle-words/main/alphabetical.txt'
+# Date of Wordle #0, the first word of the answers list
+FIRST_WORDLE_DATE = datetime.date(2021, 6, 19)
+
+
+def scheduled_words(path: str, until: datetime.date) -> list:
+    # Words of an answers list in Wordle order (one per day from FIRST_WORDLE_DATE) used up to and including until
+    words = list(load_words(path=path).index) if path.endswith('.csv') else read_word_list(path=path)
+    return words[:max((until - FIRST_WORDLE_DATE).days + 1, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Update the local snapshot of previously used Wordle words. '
+        'This is the only script that uses the network: with no path or --schedule it downloads the list from eagerterrier/previous-wordle-words.')
+    parser.add_argument('path', nargs='?', help=f'Words list with one word per line, e.g. a download of {PREVIOUS_WORDS_URL}.')
+    parser.add_argument('--schedule', help='Instead of path, an answers list in Wordle order (.csv words table or one word per line) to take the words used up to --until from.')
+    parser.add_argument('--until', default=datetime.date.today().strftime('%m/%d/%y'), help='Date of the last Wordle to include with --schedule, MM/DD/YY. (Defaults to today)')
+    parser.add_argument('--output', default=PREVIOUS_WORDS_PATH, help=f'Snapshot to write. (Defaults to {PREVIOUS_WORDS_PATH})')
+    args = parser.parse_args()
+
+    as_of = None
+    if args.schedule:
+        until = datetime.datetime.strptime(args.until, '%m/%d/%y').date()
+        previous_words = scheduled_words(path=args.schedule, until=until)
+        source, as_of = f'{args.schedule} in Wordle order, #0 ({FIRST_WORDLE_DATE:%m/%d/%y}) to #{len(previous_words)-1}', f'{until:%m/%d/%y}'
+    elif args.path:
+        previous_words, source = read_word_list(path=args.path), args.path
+    else:
+        previous_words = list(pd.read_csv(PREVIOUS_WORDS_URL, header=None).squeeze().astype('str'))
+        source = PREVIOUS_WORDS_URL
+    save_previous_words(previous_words=previous_words, source=source, as_of=as_of, path=args.output)
+    print(f'# Previous Wordle Words: {len(set(previous_words))}\nSaved: {args.output}')
+    return
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,214 @@
+# Package Imports
+import argparse
+import asyncio
+import json
+import multiprocessing as mp
+import numpy as np
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from src.helper_methods import (SORT_BY_TO_COL_MAP, SolverState, WORD_TABLE_PATH, bucket_size_distribution, bucket_sizes, check_convert_input, 
+    expected_information, load_word_data, rank_suggestions, suggestion_guesses)
+
+# Loaded once per process by init_worker
+DATA = None
+SCORE_SORT_BY_OPTIONS = ['Expected Information', 'Worst Case']
+SORT_BY_OPTIONS = list(SORT_BY_TO_COL_MAP) + SCORE_SORT_BY_OPTIONS
+STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 500: 'Internal Server Error'}
+
+
+def init_worker(datapath: str) -> None:
+    global DATA
+    DATA = load_word_data(datapath=datapath)
+
+def get_guesses(request: dict) -> dict:
+    # {'WORD': [0,1,2,1,0], etc.} from the request's game state
+    guesses = request.get('guesses', {})
+    if isinstance(guesses, dict):
+        # Same checks as the list form
+        guesses = [f'{guess}-{"".join(str(x) for x in result)}' for guess, result in guesses.items()]
+    if not isinstance(guesses, list) or not all(isinstance(guess, str) for guess in guesses):
+        raise ValueError('guesses must be a list of "WORD-01210" strings or a {"WORD": [0,1,2,1,0]} object.')
+    guesses, bad_input = check_convert_input(user_inputs=[guess.upper() for guess in guesses], word_length=DATA['index'].letters.shape[1])
+    if bad_input:
+        raise ValueError('guesses must be words of A-Z letters with feedback of 0, 1 or 2 for each letter, e.g. "WORD-01210" or {"WORD": [0,1,2,1,0]}.')
+    return guesses
+
+def get_candidates(request: dict) -> np.ndarray:
+    # Positions (in DATA['data']) of the words left by the request's game state
+    state = SolverState(words=DATA['data'], remove_previous_wordle_words=bool(request.get('remove_previous_words', False)), index=DATA['index'])
+    return state.set_guesses(guesses=get_guesses(request=request))
+
+def handle_filter(request: dict) -> dict:
+    candidates = get_candidates(request=request)
+    return {'remaining': len(candidates), 'words': list(DATA['data'].index[candidates])}
+
+def get_score_guesses(request: dict) -> np.ndarray:
+    # Positions (in DATA['data']) of the words to score, None for only the remaining words (see suggestion_guesses)
+    if 'words' in request:
+        guesses = DATA['data'].index.get_indexer([word.upper() for word in request['words']])
+        if (guesses < 0).any():
+            raise ValueError('words must all be in the words list.')
+        return guesses
+    return suggestion_guesses(words=DATA, guesses=get_guesses(request=request), hard_mode=bool(request.get('hard_mode', False)), 
+        score_all_words=bool(request.get('hard_mode_off', False)))
+
+def rank(request: dict, candidates: np.ndarray, sort_by: str) -> list:
+    # Suggested words, best first, ranked the same way as the app (see rank_suggestions)
+    if sort_by not in SORT_BY_OPTIONS:
+        raise ValueError(f'sort_by must be one of {SORT_BY_OPTIONS}.')
+    guesses = get_score_guesses(request=request) if sort_by in SCORE_SORT_BY_OPTIONS else None
+    return rank_suggestions(words=DATA, candidates=candidates, sort_by=sort_by, guesses=guesses)
+
+def handle_suggest(request: dict) -> dict:
+    candidates = get_candidates(request=request)
+    num_words = int(request.get('num_words', 10))
+    suggestions = rank(request=request, candidates=candidates, sort_by=request.get('sort_by', 'Letter Frequency'))
+    return {'remaining': len(candidates), 'suggestions': list(suggestions[:num_words])}
+
+def handle_score(request: dict) -> dict:
+    # Best guesses by expected information (or worst case for sort_by 'Worst Case') and their metrics
+    candidates = get_candidates(request=request)
+    num_words = int(request.get('num_words', 10))
+    sort_by = 'Worst Case' if request.get('sort_by') == 'Worst Case' else 'Expected Information'
+    ranked = rank(request=request, candidates=candidates, sort_by=sort_by)[:num_words]
+    scores = score(guesses=DATA['data'].index.get_indexer(ranked), candidates=candidates)
+    distribution = bucket_size_distribution(sizes=scores['sizes'])
+    return {'remaining': len(candidates), 'scores': [{'word': word, 'expectedInformation': float(scores['expectedInformation'][i]),
+        'ELR': float(scores['ELR'][i]), 'worstCase': int(scores['worstCase'][i]), 'bucketCount': int(scores['bucketCount'][i]),
+        'bucketSizes': {str(size): int(num) for size, num in enumerate(distribution[i]) if num}} for i, word in enumerate(ranked)]}
+
+def score(guesses: np.ndarray, candidates: np.ndarray) -> dict:
+    # Expected information, ELR and worst case over the remaining words of each guess, in the order given
+    sizes = bucket_sizes(patterns=DATA['patterns'][np.ix_(guesses, candidates)], word_length=DATA['index'].letters.shape[1])
+    return {'expectedInformation': expected_information(sizes=sizes), 'ELR': 1 - (sizes.astype(np.int64)**2).sum(axis=1) / max(len(candidates), 1)**2, 
+        'worstCase': sizes.max(axis=1, initial=0), 'bucketCount': (sizes > 0).sum(axis=1), 'sizes': sizes}
+
+def handle_batch(requests: list) -> list:
+    results = []
+    for request in requests:
+        try:
+            results.append(ENDPOINTS[request.get('endpoint', 'suggest')](request))
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            results.append({'error': str(error)})
+    return results
+
+ENDPOINTS = {'filter': handle_filter, 'suggest': handle_suggest, 'score': handle_score}
+
+
+class SolverService:
+    """
+    Stateless asyncio HTTP/1.1 solver service (JSON in and out, keep-alive supported).
+
+    POST /filter, /suggest, /score take one game state:
+        {"guesses": ["CRANE-01200", etc.] or {"CRANE": [0,1,2,0,0], etc.}, "remove_previous_words": false,
+         "sort_by": "Letter Frequency", "num_words": 10, "hard_mode": false, "hard_mode_off": false, "words": ["SLATE", etc.]}
+    POST /batch takes {"requests": [{"endpoint": "suggest", ...game state...}, etc.]}
+    GET /metrics reports request counts and latency percentiles, GET /health returns ok.
+
+    filter and column-sorted suggest run on the event loop; scoring and batches run in the worker pool.
+    """
+
+    def __init__(self, datapath: str, processes: int, batch_chunk: int=32):
+        init_worker(datapath=datapath)
+        self.pool = ProcessPoolExecutor(max_workers=processes, initializer=init_worker, initargs=(datapath,))
+        self.batch_chunk = batch_chunk
+        self.started = time.time()
+        self.latencies = {}
+        self.counts = {}
+
+    async def dispatch(self, method: str, path: str, body: bytes) -> tuple:
+        loop = asyncio.get_running_loop()
+        if path == '/health':
+            return 200, {'status': 'ok', 'words': len(DATA['data'])}
+        if path == '/metrics':
+            return 200, self.metrics()
+        endpoint = path.strip('/')
+        if endpoint not in ENDPOINTS and endpoint != 'batch':
+            return 404, {'error': f'Unknown endpoint {path}'}
+        if method != 'POST':
+            return 405, {'error': 'Use POST'}
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            return 400, {'error': 'Body must be JSON'}
+        try:
+            if endpoint == 'batch':
+                requests = request.get('requests', [])
+                chunks = [requests[i:i+self.batch_chunk] for i in range(0, len(requests), self.batch_chunk)]
+                results = await asyncio.gather(*[loop.run_in_executor(self.pool, handle_batch, chunk) for chunk in chunks])
+                return 200, {'results': [result for chunk in results for result in chunk]}
+            if endpoint == 'score' or request.get('sort_by') in SCORE_SORT_BY_OPTIONS:
+                return 200, await loop.run_in_executor(self.pool, ENDPOINTS[endpoint], request)
+            return 200, ENDPOINTS[endpoint](request)
+        except (ValueError, KeyError, TypeError, AttributeError) as error:
+            return 400, {'error': str(error)}
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode('latin-1').split(' ', 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get('content-length', 0)))
+                start = time.perf_counter()
+                try:
+                    status, response = await self.dispatch(method=method, path=path.split('?')[0], body=body)
+                except Exception as error:
+                    status, response = 500, {'error': repr(error)}
+                self.record(path=path, latency=time.perf_counter() - start)
+                payload = json.dumps(response).encode()
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                writer.write(f'HTTP/1.1 {status} {STATUS[status]}\r\nContent-Type: application/json\r\nContent-Length: {len(payload)}\r\n'
+                    f'Connection: {"keep-alive" if keep_alive else "close"}\r\n\r\n'.encode() + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def record(self, path: str, latency: float) -> None:
+        self.counts[path] = self.counts.get(path, 0) + 1
+        self.latencies.setdefault(path, deque(maxlen=10000)).append(latency)
+
+    def metrics(self) -> dict:
+        # Latency percentiles are over the last 10000 requests of each path
+        return {'uptimeSeconds': time.time() - self.started, 'requests': self.counts, 'latencyMs': {path: {f'p{p}': float(np.percentile(latencies, p)) * 1000
+            for p in [50, 90, 99]} for path, latencies in self.latencies.items()}}
+
+    async def serve(self, host: str, port: int) -> None:
+        server = await asyncio.start_server(self.handle_connection, host=host, port=port)
+        print(f'Serving on http://{host}:{port} ({len(DATA["data"])} words)')
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Stateless HTTP solver service.')
+    parser.add_argument('--datapath', default='Data-Preprocessed/word_freq.csv', help=f'Words table, .csv or packed .bin (e.g. {WORD_TABLE_PATH}). (Defaults to Data-Preprocessed/word_freq.csv)')
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind. (Defaults to 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000, help='Port to bind. (Defaults to 8000)')
+    parser.add_argument('--processes', type=int, default=mp.cpu_count(), help='Worker processes for scoring and batches. (Defaults to number of cores)')
+    args = parser.parse_args()
+
+    service = SolverService(datapath=args.datapath, processes=args.processes)
+    try:
+        asyncio.run(service.serve(host=args.host, port=args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.pool.shutdown()
+    return
+
+if __name__=='__main__':
+    main()
@@ -0,0 +1,139 @@
+# Package Imports
+import argparse
+import json
+import multiprocessing as mp
+import numpy as np
+import time
+from src.helper_methods import DECISION_TREE_PATH, SubsetCache, bucket_sizes, expected_information, load_pattern_matrix, load_word_data, load_word_table, load_words
+
+# Worker globals, set by init_worker
+WORDS = None
+PATTERNS = None
+WORD_LENGTH = None
+SOLVED = None
+OPTIONS = {}
+MEMO = None
+
+
+def init_worker(datapath: str, top_k: int, all_guesses: bool, cache_mb: float) -> None:
+    global WORDS, PATTERNS, WORD_LENGTH, SOLVED, MEMO
+    WORDS = load_words(path=datapath).index
+    PATTERNS = load_word_table(path=datapath)['patterns'] if datapath.endswith('.bin') else None
+    if PATTERNS is None:
+        PATTERNS = load_pattern_matrix(words=list(WORDS))
+    WORD_LENGTH = len(WORDS[0])
+    SOLVED = 3**WORD_LENGTH - 1
+    OPTIONS['top_k'] = top_k
+    OPTIONS['all_guesses'] = all_guesses
+    MEMO = SubsetCache(num_words=len(WORDS), max_bytes=int(cache_mb * 2**20))
+
+def split(guess: int, candidates: np.ndarray) -> list:
+    # Candidates left after each feedback other than solved: [(code, candidates), etc.]
+    codes = PATTERNS[guess, candidates]
+    order = np.argsort(codes, kind='stable')
+    codes, candidates = codes[order], candidates[order]
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    return [(int(bucket_codes[0]), bucket) for bucket_codes, bucket in zip(np.split(codes, bounds), np.split(candidates, bounds)) if bucket_codes[0] != SOLVED]
+
+def rank_guesses(candidates: np.ndarray) -> np.ndarray:
+    # Most promising guesses first (by expected information), candidates winning ties
+    guesses = np.arange(len(WORDS)) if OPTIONS['all_guesses'] else candidates
+    sizes = bucket_sizes(patterns=PATTERNS[np.ix_(guesses, candidates)], word_length=WORD_LENGTH)
+    useful = sizes.max(axis=1) < len(candidates)
+    useful |= np.isin(guesses, candidates)
+    order = np.lexsort((~np.isin(guesses, candidates), -np.round(expected_information(sizes=sizes), 12)))
+    return guesses[order][useful[order]][:OPTIONS['top_k']]
+
+def lower_bound(num_candidates: int) -> int:
+    # Every candidate needs at least one guess and at most one of them is solved by the next guess
+    return 2 * num_candidates - 1
+
+def guess_cost(guess: int, candidates: np.ndarray, best: float) -> float:
+    # Total guesses needed to solve every candidate when starting with guess, inf if it cannot beat best
+    buckets = split(guess=guess, candidates=candidates)
+    total = len(candidates)
+    remaining_bound = sum(lower_bound(len(bucket)) for _, bucket in buckets)
+    for _, bucket in buckets:
+        remaining_bound -= lower_bound(len(bucket))
+        if total + remaining_bound + lower_bound(len(bucket)) >= best:
+            return np.inf
+        total += solve(candidates=bucket)[0]
+    return total
+
+def solve(candidates: np.ndarray) -> tuple:
+    # (total guesses needed to solve every candidate, best guess)
+    if len(candidates) <= 2:
+        return lower_bound(len(candidates)), candidates[0]
+    key = MEMO.key(candidates=candidates)
+    best = MEMO.get(key)
+    if best is not None:
+        return best
+    best = (np.inf, None)
+    for guess in rank_guesses(candidates=candidates):
+        cost = guess_cost(guess=guess, candidates=candidates, best=best[0])
+        if cost < best[0]:
+            best = (cost, guess)
+        if best[0] == lower_bound(len(candidates)):
+            break
+    MEMO.put(key, best)
+    return best
+
+def solve_opener(opener: int) -> tuple:
+    candidates = np.arange(len(WORDS))
+    return guess_cost(guess=opener, candidates=candidates, best=np.inf), opener, MEMO.stats()
+
+def build_tree(candidates: np.ndarray, guess: int=None) -> dict:
+    # {'g': guess, 'c': {feedback code: subtree, etc.}}
+    if guess is None:
+        guess = solve(candidates=candidates)[1]
+    return {'g': WORDS[guess], 'c': {str(code): build_tree(candidates=bucket) for code, bucket in split(guess=guess, candidates=candidates)}}
+
+def answer_depths(tree: dict) -> np.ndarray:
+    # Number of guesses the tree takes for each answer
+    depths = np.zeros(len(WORDS), dtype=np.int64)
+    for answer in range(len(WORDS)):
+        node = tree
+        depths[answer] = 1
+        while node['g'] != WORDS[answer]:
+            node = node['c'][str(PATTERNS[WORDS.get_loc(node['g']), answer])]
+            depths[answer] += 1
+    return depths
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Search for a guessing policy with minimal average guesses and save it as a decision tree.')
+    parser.add_argument('--datapath', default='Data-Preprocessed/word_freq.csv', help='Words table, .csv or packed .bin. (Defaults to Data-Preprocessed/word_freq.csv)')
+    parser.add_argument('--top-k', type=int, default=8, help='Guesses searched at each node, ranked by expected information. (Defaults to 8)')
+    parser.add_argument('--openers', type=int, default=16, help='First guesses searched in parallel. (Defaults to 16)')
+    parser.add_argument('--all-guesses', action='store_true', help='Also search guesses that cannot be the answer.')
+    parser.add_argument('--cache-mb', type=float, default=256, help='Memory limit of each process\'s candidate subset cache in MB. (Defaults to 256)')
+    parser.add_argument('--processes', type=int, default=mp.cpu_count(), help='Worker processes. (Defaults to number of cores)')
+    parser.add_argument('--output', default=DECISION_TREE_PATH, help=f'Decision tree file. (Defaults to {DECISION_TREE_PATH})')
+    args = parser.parse_args()
+    start = time.time()
+
+    init_worker(datapath=args.datapath, top_k=args.openers, all_guesses=args.all_guesses, cache_mb=args.cache_mb)
+    candidates = np.arange(len(WORDS))
+    openers = rank_guesses(candidates=candidates)
+    OPTIONS['top_k'] = args.top_k
+    print(f'Words: {len(WORDS)}\nOpeners: {list(WORDS[openers])}')
+    with mp.Pool(processes=args.processes, initializer=init_worker, initargs=(args.datapath, args.top_k, args.all_guesses, args.cache_mb)) as pool:
+        results = []
+        for cost, opener, cache_stats in pool.imap_unordered(solve_opener, openers):
+            results.append((cost, opener))
+            print(f'{WORDS[opener]}: {cost/len(WORDS):.4f} average guesses ({time.time()-start:.1f}s, cache {cache_stats})')
+    cost, opener = min(results)
+
+    tree = build_tree(candidates=candidates, guess=opener)
+    # The app only uses the tree with the words table it was built from
+    saved_tree = {'word_length': WORD_LENGTH, 'version': load_word_data(datapath=args.datapath)['version'], 'tree': tree}
+    with open(args.output, 'w') as file:
+        json.dump(saved_tree, file, separators=(',', ':'))
+    depths = answer_depths(tree=tree)
+    print(f'Best Opener: {WORDS[opener]}\nAverage Guesses: {depths.mean():.4f}\nMax Guesses: {depths.max()}')
+    print(f'Cache: {MEMO.stats()}')
+    print(f'Saved: {args.output}\nSeconds Elapsed: {time.time()-start:.2f}')
+    return
+
+if __name__=='__main__':
+    main()
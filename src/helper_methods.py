@@ -1,5 +1,34 @@
 import pandas as pd
+import numpy as np
+import hashlib
+import json
+import os
 import re
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from functools import lru_cache
+try:
+    from profiling import profiled
+except ImportError:
+    # Imported as src.helper_methods from the repo root
+    from src.profiling import profiled
+
+
+PATTERN_MATRIX_PATH = 'Data-Preprocessed/pattern_matrix.npz'
+SORT_BY_TO_COL_MAP = {'Word Frequency': 'wordFreq', 'Letter Frequency': 'letterFreqSum', 'Letter at Position Frequency': 'letterPosFreqSum'}
+DECISION_TREE_PATH = 'Data-Preprocessed/decision_tree.json'
+WORD_TABLE_PATH = 'Data-Preprocessed/word_freq.bin'
+WORD_TABLE_VERSION = 1
+# Little endian header of a packed word table, followed by one COLUMN_DTYPE entry per feature column
+HEADER_DTYPE = np.dtype([('magic', 'S4'), ('version', '<u2'), ('word_length', '<u2'), ('num_words', '<u4'), ('num_columns', '<u2'), 
+    ('pattern_dtype', 'S4'), ('checksum', '<u4'), ('reserved', 'V42')])
+COLUMN_DTYPE = np.dtype([('name', 'S28'), ('dtype', 'S4')])
+PREVIOUS_WORDS_PATH = 'Data-Preprocessed/previous_wordle_words.txt'
+RESULT_STORE_PATH = 'Data-Preprocessed/result_store.sqlite'
 
 
 def repeated_letter(word: str) -> dict:
@@ -11,27 +40,22 @@ def repeated_letter(word: str) -> dict:
 
     Returns:
         dict: {
-            'A':{1,2},
-            'B':{0,3},
-            etc.
-        } # Dictionary of repeated letters and the indices where they are repeated.
-    """
-    repeats = {'letters':{}, 'indices':set({})}
-    for i_a in range(len(word)):
-        letter_a = word[i_a]
-        for i_b in range(i_a+1, len(word)):
-            letter_b = word[i_b]
-            if letter_a == letter_b:
-                if letter_a in repeats:
-                    repeats['letters'][letter_a].add(i_b)
-                    repeats['indices'].add(i_b)
-                else:
-                    repeats['letters'][letter_a] = set({i_a, i_b})
-                    repeats['indices'].add(i_a)
-                    repeats['indices'].add(i_b)
-    return repeats
+            'letters':{
+                'A':{1,2},
+                'B':{0,3,4},
+                etc.
+                }, # Dictionary of repeated letters and the indices where they appear.
+            'indices':{0,1,2,3,4} # Indices of all repeated letters.
+        }
+    """
+    positions = {}
+    for i, letter in enumerate(word):
+        positions.setdefault(letter, set()).add(i)
+    letters = {letter: indices for letter, indices in positions.items() if len(indices) > 1}
+    return {'letters': letters, 'indices': set().union(*letters.values())}
 
 
+@profiled()
 def compare(guess: str, actual: str) -> list:
     """
     Compares guess to actual. This method is intended to match the output from the Wordle game.
@@ -67,6 +91,7 @@ def compare(guess: str, actual: str) -> list:
     return result
 
 
+@profiled()
 def add_known_info(guess: str, result: list, knowns: dict) -> dict:
     """
     Add new information about correctness of guesses to knowns.
@@ -133,7 +158,234 @@ def add_known_info(guess: str, result: list, knowns: dict) -> dict:
     return knowns_local
 
 
-def filter_words(guesses: dict, words: pd.DataFrame, remove_previous_wordle_words: bool, word_length: int=5) -> pd.DataFrame:
+def encode_words(words: list) -> np.ndarray:
+    """
+    Encode equal length uppercase words as a fixed-width letter matrix.
+
+    Args:
+        words (list): Words to encode.
+
+    Returns:
+        np.ndarray: uint8 matrix of shape (len(words), word length) with 'A' -> 0, 'B' -> 1, etc.
+    """
+    words = list(words)
+    if not words:
+        return np.zeros((0, 0), dtype=np.uint8)
+    letters = np.frombuffer(''.join(words).encode('ascii'), dtype=np.uint8)
+    return (letters - ord('A')).reshape(len(words), -1)
+
+
+def letter_counts(letters: np.ndarray) -> np.ndarray:
+    """
+    Args:
+        letters (np.ndarray): Encoded letter matrix (see encode_words).
+
+    Returns:
+        np.ndarray: uint8 matrix of shape (len(letters), 26) with the number of times each letter appears in each word.
+    """
+    offsets = np.arange(len(letters), dtype=np.int64)[:, None] * 26
+    return np.bincount((letters + offsets).ravel(), minlength=len(letters) * 26).reshape(len(letters), 26).astype(np.uint8)
+
+
+def letter_positions(letters: np.ndarray) -> np.ndarray:
+    """
+    Args:
+        letters (np.ndarray): Encoded letter matrix (see encode_words), words up to 32 letters long.
+
+    Returns:
+        np.ndarray: uint32 matrix of shape (len(letters), 26) with a bitmask of the positions of each letter in each word
+            (bit 0 -> first position, bit 1 -> second position, etc.).
+    """
+    positions = np.zeros((len(letters), 26), dtype=np.uint32)
+    rows = np.arange(len(letters))
+    for i in range(letters.shape[1]):
+        positions[rows, letters[:, i]] |= np.uint32(1 << i)
+    return positions
+
+
+class WordIndex:
+    """
+    Precomputed letter index over a words list used to filter on knowns with a few boolean array operations.
+
+    Attributes:
+        words (pd.Index): Indexed words, in order.
+        letters (np.ndarray): Letter codes at each position (see encode_words), shape (num words, word length).
+        presence (np.ndarray): Bitmask of the letters in each word (bit 0 -> 'A', bit 1 -> 'B', etc.).
+        counts (np.ndarray): Number of times each letter appears in each word, shape (num words, 26).
+        positions (np.ndarray): Bitmask of the positions of each letter in each word, shape (num words, 26) (see letter_positions).
+        repeats (np.ndarray): Whether each word has a repeated letter.
+    """
+
+    def __init__(self, words: list, letters: np.ndarray=None):
+        """
+        Args:
+            words (list): Words to index.
+            letters (np.ndarray): Letter codes of words if already encoded, e.g. memory-mapped from a word table (see load_word_table).
+                Encoded from words if not provided. (Defaults to None)
+        """
+        self.words = pd.Index(words)
+        self.letters = encode_words(self.words) if letters is None else letters
+        self.counts = letter_counts(self.letters)
+        self.positions = letter_positions(self.letters)
+        self.repeats = self.counts.max(axis=1, initial=0) > 1
+        self.presence = ((self.counts > 0).astype(np.uint32) << np.arange(26, dtype=np.uint32)).sum(axis=1, dtype=np.uint32)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def mask(self, knowns: dict) -> np.ndarray:
+        """
+        Find the words matching knowns. Equivalent to the exact, filter_exclude, filter_exclude_at,
+        filter_max_num_letter, and filter_min_num_letter filters applied in filter_words.
+
+        Args:
+            knowns (dict): Known information (see add_known_info).
+
+        Returns:
+            np.ndarray: Boolean mask over words, True where the word is retained.
+        """
+        mask = np.ones(len(self.words), dtype=bool)
+        if not len(self.words):
+            return mask
+        mask = self.mask_exact(exact=knowns['exact'], mask=mask)
+        mask = self.mask_exclude(exclude=knowns['exclude'], mask=mask)
+        mask = self.mask_exclude_at(exclude_at=knowns['exclude_at'], mask=mask)
+        mask = self.mask_max_num_letter(max_num_letter=knowns['max_num_letter'], mask=mask)
+        mask = self.mask_min_num_letter(min_num_letter=knowns['min_num_letter'], mask=mask)
+        return mask
+
+    @profiled(stage='WordIndex.mask_exact', rows_arg='mask')
+    def mask_exact(self, exact: list, mask: np.ndarray) -> np.ndarray:
+        # Retain words with the known letters at the known positions
+        for i, letter in enumerate(exact):
+            if letter != '.':
+                mask = mask & (self.letters[:, i] == ord(letter) - ord('A'))
+        return mask
+
+    @profiled(stage='WordIndex.mask_exclude', rows_arg='mask')
+    def mask_exclude(self, exclude: set, mask: np.ndarray) -> np.ndarray:
+        # Remove words with any excluded letter
+        exclude_bits = 0
+        for letter in exclude:
+            exclude_bits |= 1 << (ord(letter) - ord('A'))
+        return mask & ((self.presence & np.uint32(exclude_bits)) == 0)
+
+    @profiled(stage='WordIndex.mask_exclude_at', rows_arg='mask')
+    def mask_exclude_at(self, exclude_at: dict, mask: np.ndarray) -> np.ndarray:
+        # Retain words with every inexact match letter, but not at any known mismatch location
+        include_bits = 0
+        for letter, indices in exclude_at.items():
+            code = ord(letter) - ord('A')
+            include_bits |= 1 << code
+            index_bits = sum(1 << index for index in indices)
+            mask = mask & ((self.positions[:, code] & np.uint32(index_bits)) == 0)
+        return mask & ((self.presence & np.uint32(include_bits)) == include_bits)
+
+    @profiled(stage='WordIndex.mask_max_num_letter', rows_arg='mask')
+    def mask_max_num_letter(self, max_num_letter: dict, mask: np.ndarray) -> np.ndarray:
+        for letter, num in max_num_letter.items():
+            mask = mask & (self.counts[:, ord(letter) - ord('A')] <= num)
+        return mask
+
+    @profiled(stage='WordIndex.mask_min_num_letter', rows_arg='mask')
+    def mask_min_num_letter(self, min_num_letter: dict, mask: np.ndarray) -> np.ndarray:
+        for letter, num in min_num_letter.items():
+            mask = mask & (self.counts[:, ord(letter) - ord('A')] >= num)
+        return mask
+
+
+def get_knowns(guesses: dict, word_length: int=5) -> dict:
+    """
+    Collect the known information from guesses and their feedback.
+
+    Args:
+        guesses (dict): {
+            'word1':[X,X,X,X,X],
+            'word2':[X,X,X,X,X],
+            etc.
+            } # Guesses and feedback (see filter_words)
+        word_length (int): Length of words. (Defaults to 5)
+
+    Returns:
+        dict: Known information (see add_known_info).
+    """
+    knowns = {'exact':['.']*word_length, 'exclude_at':{}, 'exclude': set({}), 'max_num_letter':{}, 'min_num_letter':{}}
+    for guess, result in guesses.items():
+        if len(guess) != word_length or len(result) != word_length:
+            raise ValueError(f'Guess {guess} and its feedback must be {word_length} letters long.')
+        knowns = add_known_info(guess=guess, result=result, knowns=knowns)
+    return knowns
+
+
+class CompiledKnowns:
+    """
+    Known information (see add_known_info) compiled once into letter codes and bitmasks,
+    so it can be checked against a WordIndex many times with a few array operations.
+
+    Hard mode requires every later guess to use the revealed hints: 
+    known exact letters in place and at least the known minimum number of each revealed letter.
+    Candidates must also satisfy the exclusions and maximums, so both sets share the hard mode checks.
+
+    Attributes:
+        exact_positions (np.ndarray): Positions with a known exact letter.
+        exact_codes (np.ndarray): Letter codes (see encode_words) at exact_positions.
+        exclude_bits (int): Bitmask of the letters excluded entirely (see WordIndex.presence).
+        exclude_at_codes (np.ndarray): Letter codes of the inexact match letters.
+        exclude_at_bits (np.ndarray): Bitmask of the known mismatch positions of each exclude_at_codes letter (see WordIndex.positions).
+        max_codes (np.ndarray): Letter codes with a known maximum number of repeats.
+        max_nums (np.ndarray): Their maximums.
+        min_codes (np.ndarray): Letter codes with a known minimum number of repeats.
+        min_nums (np.ndarray): Their minimums.
+    """
+
+    def __init__(self, knowns: dict):
+        exact = [(i, ord(letter) - ord('A')) for i, letter in enumerate(knowns['exact']) if letter != '.']
+        self.exact_positions = np.array([i for i, _ in exact], dtype=np.int64)
+        self.exact_codes = np.array([code for _, code in exact], dtype=np.uint8)
+        self.exclude_bits = sum(1 << (ord(letter) - ord('A')) for letter in knowns['exclude'])
+        self.exclude_at_codes = np.array([ord(letter) - ord('A') for letter in knowns['exclude_at']], dtype=np.int64)
+        self.exclude_at_bits = np.array([sum(1 << i for i in indices) for indices in knowns['exclude_at'].values()], dtype=np.uint32)
+        self.max_codes = np.array([ord(letter) - ord('A') for letter in knowns['max_num_letter']], dtype=np.int64)
+        self.max_nums = np.array(list(knowns['max_num_letter'].values()), dtype=np.int64)
+        self.min_codes = np.array([ord(letter) - ord('A') for letter in knowns['min_num_letter']], dtype=np.int64)
+        self.min_nums = np.array(list(knowns['min_num_letter'].values()), dtype=np.int64)
+
+    @profiled(stage='CompiledKnowns.evaluate', rows_arg='rows')
+    def evaluate(self, index: WordIndex, rows: np.ndarray=None) -> tuple:
+        """
+        Find the legal hard mode guesses and the candidates in one pass over index.
+
+        Args:
+            index (WordIndex): Letter index of the words.
+            rows (np.ndarray): Positions (in index) to check, e.g. the legal guesses of an earlier state, 
+                since knowns only get stricter. (Defaults to every word)
+
+        Returns:
+            tuple: (positions of the legal hard mode guesses, positions of the candidates), both subsets of rows
+        """
+        if rows is None:
+            letters, counts, presence, positions = index.letters, index.counts, index.presence, index.positions
+        else:
+            rows = np.asarray(rows)
+            letters, counts, presence, positions = index.letters[rows], index.counts[rows], index.presence[rows], index.positions[rows]
+        legal = np.ones(len(letters), dtype=bool)
+        for position, code in zip(self.exact_positions, self.exact_codes):
+            legal &= letters[:, position] == code
+        for code, num in zip(self.min_codes, self.min_nums):
+            legal &= counts[:, code] >= num
+        candidate = legal & ((presence & np.uint32(self.exclude_bits)) == 0)
+        for code, num in zip(self.max_codes, self.max_nums):
+            candidate &= counts[:, code] <= num
+        for code, bits in zip(self.exclude_at_codes, self.exclude_at_bits):
+            candidate &= (positions[:, code] & bits) == 0
+        legal, candidate = np.flatnonzero(legal), np.flatnonzero(candidate)
+        if rows is not None:
+            legal, candidate = rows[legal], rows[candidate]
+        return legal, candidate
+
+
+@profiled()
+def filter_words(guesses: dict, words: pd.DataFrame, remove_previous_wordle_words: bool, word_length: int=None, index: WordIndex=None) -> pd.DataFrame:
     """
     Filters words based on guesses.
 
@@ -148,28 +400,26 @@ def filter_words(guesses: dict, words: pd.DataFrame, remove_previous_wordle_word
                 # 2 means letter and location are correct (exact)
         words (pd.DataFrame): List of current possible words and their characteristics (index is 'word').
         remove_previous_wordle_words (bool): Remove previously used Wordle words from suggested words list. 
-            List of previous Wordle words pulled from: https://raw.githubusercontent.com/eagerterrier/previous-wordle-words/main/alphabetical.txt
-        word_length (int): Set length of words. (Defaults to 5)
+            List of previous Wordle words is the local snapshot PREVIOUS_WORDS_PATH (see load_previous_words).
+        word_length (int): Set length of words. (Defaults to the length of the words in words, or 5 if there are none)
+        index (WordIndex): Precomputed index of words.index, reuse it across calls on the same words. 
+            Built from words if not provided. (Defaults to None)
 
     Returns:
         pd.DataFrame: Filtered words.
     """
-    knowns = {'exact':['.']*word_length, 'exclude_at':{}, 'exclude': set({}), 'max_num_letter':{}, 'min_num_letter':{}}
-    for guess, result in guesses.items():
-        if len(guess) == word_length:
-            knowns = add_known_info(guess=guess, result=result, knowns=knowns)
-    filtered_words = words.copy()
+    if word_length is None:
+        word_length = len(words.index[0]) if len(words) else 5
+    knowns = get_knowns(guesses=guesses, word_length=word_length)
+    if index is None:
+        index = WordIndex(words=words.index)
+    filtered_words = words[index.mask(knowns=knowns)]
     if remove_previous_wordle_words:
         filtered_words = filter_previous_words(words=filtered_words)
-    # Filter exact matches
-    filtered_words = filtered_words.filter(regex=''.join(knowns['exact']), axis=0)
-    filtered_words = filter_exclude(exclude=knowns['exclude'], words=filtered_words)
-    filtered_words = filter_exclude_at(exclude_at=knowns['exclude_at'], words=filtered_words, word_length=len(knowns['exact']))
-    filtered_words = filter_max_num_letter(max_num_letter=knowns['max_num_letter'], words=filtered_words)
-    filtered_words = filter_min_num_letter(min_num_letter=knowns['min_num_letter'], words=filtered_words)
     return filtered_words
 
 
+@profiled()
 def filter_previous_words(words: pd.DataFrame) -> pd.DataFrame:
     """
     Filter words by retaining only words that have not been used in the Wordle game before.
@@ -180,12 +430,78 @@ def filter_previous_words(words: pd.DataFrame) -> pd.DataFrame:
     Returns:
         pd.DataFrame: Filtered words.
     """
-    url = 'https://raw.githubusercontent.com/eagerterrier/previous-wordle-words/main/alphabetical.txt'
-    previous_words = list(pd.read_csv(url, header=None).squeeze().str.upper())
-    filtered_index = pd.Index(data=[word for word in words.index if word not in previous_words])
-    return words.loc[filtered_index]
+    return words[~words.index.isin(load_previous_words())]
+
+
+def read_word_list(path: str) -> list:
+    """
+    Read a list of words with one word per line. Blank lines and lines starting with '#' are skipped.
+
+    Args:
+        path (str): Location of the words list.
+
+    Returns:
+        list: Uppercase words in file order.
+    """
+    with open(path, 'r') as file:
+        return [line.strip().upper() for line in file if line.strip() and not line.startswith('#')]
 
 
+def save_previous_words(previous_words: list, source: str, as_of: str=None, path: str=PREVIOUS_WORDS_PATH) -> None:
+    """
+    Write a snapshot of the previously used Wordle words, sorted and with a header recording where it came from and which date it covers.
+
+    Args:
+        previous_words (list): Previously used Wordle words.
+        source (str): Where the words came from.
+        as_of (str): Date of the last Wordle included (MM/DD/YY). (Defaults to today)
+        path (str): Location of the snapshot. (Defaults to PREVIOUS_WORDS_PATH)
+    """
+    with open(path, 'w') as file:
+        file.write(f'# Source: {source}\n')
+        file.write(f'# Accessed: {time.strftime("%m/%d/%y")}\n')
+        file.write(f'# As of: {as_of or time.strftime("%m/%d/%y")}\n')
+        for word in sorted(set(word.upper() for word in previous_words)):
+            file.write(f'{word}\n')
+
+
+@lru_cache(maxsize=4)
+def _read_previous_words(path: str, mtime: int) -> frozenset:
+    # Cached per modification time, so a refreshed snapshot is picked up without restarting
+    return frozenset(read_word_list(path=path))
+
+
+def load_previous_words(path: str=PREVIOUS_WORDS_PATH) -> frozenset:
+    """
+    Load the local snapshot of previously used Wordle words, read from disk again only when it changes.
+    The snapshot is committed with the repository, use refresh_previous_words.py to update it.
+
+    Args:
+        path (str): Location of the snapshot. (Defaults to PREVIOUS_WORDS_PATH)
+
+    Returns:
+        frozenset: Previously used Wordle words.
+
+    Raises:
+        FileNotFoundError: There is no snapshot at path.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f'No previous Wordle words snapshot at {path}, run refresh_previous_words.py to create it')
+    return _read_previous_words(path=path, mtime=os.stat(path).st_mtime_ns)
+
+
+def previous_words_version(path: str=PREVIOUS_WORDS_PATH) -> str:
+    """
+    Args:
+        path (str): Location of the snapshot. (Defaults to PREVIOUS_WORDS_PATH)
+
+    Returns:
+        str: Checksum of the previously used Wordle words, changes whenever the snapshot is refreshed with different words.
+    """
+    return f'{zlib.crc32(",".join(sorted(load_previous_words(path=path))).encode()):08x}'
+
+
+@profiled()
 def filter_exclude(exclude: set, words: pd.DataFrame) -> pd.DataFrame:
     """
     Filter words by removing any letter in exclude.
@@ -203,6 +519,7 @@ def filter_exclude(exclude: set, words: pd.DataFrame) -> pd.DataFrame:
     return words[~mask]
 
 
+@profiled()
 def filter_exclude_at(exclude_at: dict, words: pd.DataFrame, word_length: int) -> pd.DataFrame:
     """
     Filters words based on exclude_at matches. 
@@ -236,6 +553,7 @@ def filter_exclude_at(exclude_at: dict, words: pd.DataFrame, word_length: int) -
     return words[mask_include & ~mask_exclude]
 
 
+@profiled()
 def filter_max_num_letter(max_num_letter: dict, words: pd.DataFrame) -> pd.DataFrame:
     """
     Filters words by removing any words with letters repeated more than specified in max_num_letter.
@@ -251,16 +569,17 @@ def filter_max_num_letter(max_num_letter: dict, words: pd.DataFrame) -> pd.DataF
     Returns:
         pd.DataFrame: Filtered words.
     """
-    if max_num_letter:
-        filtered_words = pd.Series(data=words.index)
+    if max_num_letter and len(words):
+        counts = letter_counts(encode_words(words.index))
+        mask = np.ones(len(words), dtype=bool)
         for restricted_letter in max_num_letter:
-            mask = filtered_words.apply(lambda x: x.count(restricted_letter) > max_num_letter[restricted_letter])
-            filtered_words = filtered_words[~mask]
-        return words.loc[filtered_words]
+            mask = mask & ~(counts[:, ord(restricted_letter) - ord('A')] > max_num_letter[restricted_letter])
+        return words[mask]
     else:
         return words
 
 
+@profiled()
 def filter_min_num_letter(min_num_letter: dict, words: pd.DataFrame) -> pd.DataFrame:
     """
     Filters words by removing any words with letters repeated less than specified in min_num_letter.
@@ -276,42 +595,993 @@ def filter_min_num_letter(min_num_letter: dict, words: pd.DataFrame) -> pd.DataF
     Returns:
         pd.DataFrame: Filtered words.
     """
-    if min_num_letter:
-        filtered_words = pd.Series(data=words.index)
+    if min_num_letter and len(words):
+        counts = letter_counts(encode_words(words.index))
+        mask = np.ones(len(words), dtype=bool)
         for restricted_letter in min_num_letter:
-            mask = filtered_words.apply(lambda x: x.count(restricted_letter) < min_num_letter[restricted_letter])
-            filtered_words = filtered_words[~mask]
-        return words.loc[filtered_words]
+            mask = mask & ~(counts[:, ord(restricted_letter) - ord('A')] < min_num_letter[restricted_letter])
+        return words[mask]
     else:
         return words
 
 
-def elr(words: pd.DataFrame, word_legnth: int) -> pd.DataFrame:
+def encode_result(result: list) -> int:
+    """
+    Encode a Wordle response as a single base-3 integer.
+    Position 0 is the least significant digit, so [2,0,0,0,0] -> 2 and [0,0,0,0,1] -> 81.
+
+    Args:
+        result (list): Response from Wordle: [X,X,X,X,X] (ints: 0, 1, or 2)
+
+    Returns:
+        int: Feedback pattern code.
+    """
+    code = 0
+    for i in reversed(range(len(result))):
+        code = code * 3 + result[i]
+    return code
+
+
+def decode_result(code: int, word_length: int=5) -> list:
+    """
+    Decode a feedback pattern code back into a Wordle response.
+
+    Args:
+        code (int): Feedback pattern code (see encode_result).
+        word_length (int): Length of words. (Defaults to 5)
+
+    Returns:
+        list: Response from Wordle: [X,X,X,X,X] (ints: 0, 1, or 2)
+    """
+    result = []
+    for i in range(word_length):
+        result.append(code % 3)
+        code //= 3
+    return result
+
+
+def pattern_dtype(word_length: int) -> type:
+    """
+    Smallest unsigned integer type able to hold every feedback pattern code for word_length.
+
+    Args:
+        word_length (int): Length of words.
+
+    Returns:
+        type: np.uint8, np.uint16 or np.uint32.
+    """
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if 3**word_length <= np.iinfo(dtype).max + 1:
+            return dtype
+    raise ValueError(f'Word length {word_length} is too long to encode feedback patterns.')
+
+
+@profiled()
+def compare_batch(guesses, actuals, guess_repeats: np.ndarray=None, actual_counts: np.ndarray=None) -> np.ndarray:
+    """
+    Vectorized compare: feedback pattern codes (see encode_result) for every guess against every actual word.
+
+    Repeated letters are handled exactly like compare: 
+    a non-exact letter is an inexact match only while the actual word has unmatched copies of that letter left,
+    earlier positions in the guess claiming copies first.
+
+    Args:
+        guesses (str, list, or np.ndarray): A single guess, a list of guesses, or an encoded letter matrix (see encode_words).
+        actuals (str, list, or np.ndarray): A single actual word, a list of actual words, or an encoded letter matrix.
+        guess_repeats (np.ndarray): Whether each guess has a repeated letter, e.g. from WordIndex.repeats. 
+            Computed from guesses if not provided. (Defaults to None)
+        actual_counts (np.ndarray): Letter counts of the actual words (see letter_counts), e.g. from WordIndex.counts. 
+            Computed from actuals if not provided. (Defaults to None)
+
+    Returns:
+        np.ndarray: Codes of shape (len(guesses), len(actuals)). 
+            A single guess (str) returns shape (len(actuals),) and a single pair returns a scalar.
+    """
+    single_guess = isinstance(guesses, str)
+    single_actual = isinstance(actuals, str)
+    guess_letters = guesses if isinstance(guesses, np.ndarray) else encode_words([guesses] if single_guess else guesses)
+    actual_letters = actuals if isinstance(actuals, np.ndarray) else encode_words([actuals] if single_actual else actuals)
+    word_length = guess_letters.shape[1]
+    codes = np.zeros((guess_letters.shape[0], actual_letters.shape[0]), dtype=np.int64)
+    weights = 3**np.arange(word_length, dtype=np.int64)
+    repeats = letter_counts(guess_letters).max(axis=1, initial=0) > 1 if guess_repeats is None else np.asarray(guess_repeats, dtype=bool)
+    # Guesses without repeated letters: a non-exact letter is an inexact match whenever the actual word has it,
+    # since no exact match or earlier position of the guess can use up a copy of it
+    rows = np.flatnonzero(~repeats)
+    if len(rows):
+        g = guess_letters[rows]
+        exact = g[:, None, :] == actual_letters[None, :, :]
+        counts = letter_counts(actual_letters) if actual_counts is None else actual_counts
+        present = (counts > 0).T[g].transpose(0, 2, 1)
+        codes[rows] = ((2 * exact + (~exact & present)) * weights).sum(axis=2)
+    rows = np.flatnonzero(repeats)
+    if len(rows):
+        g = guess_letters[rows][:, None, :]
+        a = actual_letters[None, :, :]
+        exact = g == a
+        for i in range(word_length):
+            letter = g[:, :, i:i+1]
+            # Unmatched copies of this letter in the actual word
+            available = ((a == letter) & ~exact).sum(axis=2)
+            # Copies already claimed by earlier non-exact positions of the guess
+            claimed = ((g[:, :, :i] == letter) & ~exact[:, :, :i]).sum(axis=2)
+            inexact = ~exact[:, :, i] & (available > claimed)
+            codes[rows] += (2 * exact[:, :, i] + inexact) * weights[i]
+    codes = codes.astype(pattern_dtype(word_length))
+    if single_guess and single_actual:
+        return codes[0, 0]
+    if single_guess:
+        return codes[0]
+    if single_actual:
+        return codes[:, 0]
+    return codes
+
+
+def pattern_matrix(words: list, chunk_size: int=256) -> np.ndarray:
+    """
+    Compute the feedback pattern code of every guess against every potential Wordle word.
+
+    Args:
+        words (list): Words to use both as guesses and as potential Wordle words.
+        chunk_size (int): Number of guesses compared per vectorized batch. (Defaults to 256)
+
+    Returns:
+        np.ndarray: Matrix of shape (len(words), len(words)); entry [g, a] is encode_result(compare(words[g], words[a])).
+    """
+    letters = encode_words(words)
+    counts = letter_counts(letters)
+    repeats = counts.max(axis=1, initial=0) > 1
+    patterns = np.zeros((len(words), len(words)), dtype=pattern_dtype(letters.shape[1]))
+    for start in range(0, len(words), chunk_size):
+        patterns[start:start+chunk_size] = compare_batch(guesses=letters[start:start+chunk_size], actuals=letters, 
+            guess_repeats=repeats[start:start+chunk_size], actual_counts=counts)
+    return patterns
+
+
+def word_delta(old_words: list, new_words: list) -> tuple:
+    """
+    Args:
+        old_words (list): Previous words list.
+        new_words (list): Updated words list.
+
+    Returns:
+        tuple: (positions in old_words of the kept words, positions in new_words of the kept words, 
+            positions in new_words of the added words), kept words in the order of new_words
+    """
+    old_index = pd.Index(old_words)
+    positions = old_index.get_indexer(new_words)
+    kept = np.flatnonzero(positions >= 0)
+    return positions[kept], kept, np.flatnonzero(positions < 0)
+
+
+def update_pattern_matrix(patterns: np.ndarray, old_words: list, new_words: list, chunk_size: int=256) -> np.ndarray:
+    """
+    Update the feedback pattern matrix of old_words to new_words, only computing the rows and columns of added words.
+    Takes O(N * number of added words) comparisons instead of O(N**2) for pattern_matrix.
+
+    Args:
+        patterns (np.ndarray): Feedback pattern matrix of old_words (see pattern_matrix).
+        old_words (list): Words patterns was computed for.
+        new_words (list): Updated words list, in any order.
+        chunk_size (int): Number of guesses compared per vectorized batch. (Defaults to 256)
+
+    Returns:
+        np.ndarray: Feedback pattern matrix of new_words.
+    """
+    old_kept, new_kept, added = word_delta(old_words=old_words, new_words=new_words)
+    letters = encode_words(new_words)
+    counts = letter_counts(letters)
+    repeats = counts.max(axis=1, initial=0) > 1
+    updated = np.zeros((len(new_words), len(new_words)), dtype=patterns.dtype)
+    updated[np.ix_(new_kept, new_kept)] = patterns[np.ix_(old_kept, old_kept)]
+    for start in range(0, len(added), chunk_size):
+        rows = added[start:start+chunk_size]
+        updated[rows] = compare_batch(guesses=letters[rows], actuals=letters, guess_repeats=repeats[rows], actual_counts=counts)
+    for start in range(0, len(new_kept), chunk_size):
+        rows = new_kept[start:start+chunk_size]
+        updated[np.ix_(rows, added)] = compare_batch(guesses=letters[rows], actuals=letters[added], guess_repeats=repeats[rows], actual_counts=counts[added])
+    return updated
+
+
+def update_bucket_sizes(sizes: np.ndarray, old_words: list, new_words: list, chunk_size: int=256) -> np.ndarray:
+    """
+    Update the feedback pattern bucket sizes of every word over old_words (see bucket_sizes) to new_words.
+    Kept words only have the feedback against removed and added words taken out of and added to their buckets,
+    so this takes O(N * number of changed words) comparisons instead of O(N**2) for a full recompute.
+
+    Args:
+        sizes (np.ndarray): Bucket sizes of old_words as guesses against old_words, shape (len(old_words), 3**word_length).
+        old_words (list): Words sizes was computed for.
+        new_words (list): Updated words list, in any order.
+        chunk_size (int): Number of guesses compared per vectorized batch. (Defaults to 256)
+
+    Returns:
+        np.ndarray: Bucket sizes of new_words as guesses against new_words.
+    """
+    old_kept, new_kept, added = word_delta(old_words=old_words, new_words=new_words)
+    removed = np.setdiff1d(np.arange(len(old_words)), old_kept)
+    word_length = int(round(np.log(sizes.shape[1]) / np.log(3)))
+    old_letters = encode_words(old_words) if len(old_words) else np.zeros((0, word_length), dtype=np.uint8)
+    letters = encode_words(new_words) if len(new_words) else np.zeros((0, word_length), dtype=np.uint8)
+    updated = np.zeros((len(new_words), sizes.shape[1]), dtype=np.int64)
+    updated[new_kept] = sizes[old_kept]
+    for start in range(0, len(new_kept), chunk_size):
+        rows = new_kept[start:start+chunk_size]
+        if len(removed):
+            updated[rows] -= bucket_sizes(patterns=compare_batch(guesses=letters[rows], actuals=old_letters[removed]), word_length=word_length)
+        if len(added):
+            updated[rows] += bucket_sizes(patterns=compare_batch(guesses=letters[rows], actuals=letters[added]), word_length=word_length)
+    for start in range(0, len(added), chunk_size):
+        rows = added[start:start+chunk_size]
+        updated[rows] = bucket_sizes(patterns=compare_batch(guesses=letters[rows], actuals=letters), word_length=word_length)
+    return updated.astype(sizes.dtype)
+
+
+def load_pattern_matrix(words: list, path: str=None) -> np.ndarray:
+    """
+    Load the feedback pattern matrix for words from path, building and saving it first if it is missing.
+    A matrix saved for a different words list of the same length is updated (see update_pattern_matrix) instead of rebuilt.
+    The file is written to a temporary file and renamed, so processes loading it concurrently never read a partial file.
+
+    Args:
+        words (list): Words to use both as guesses and as potential Wordle words.
+        path (str): Location of the persisted matrix (.npz). 
+            (Defaults to PATTERN_MATRIX_PATH for five letter words, 'Data-Preprocessed/pattern_matrix_<length>.npz' otherwise)
+
+    Returns:
+        np.ndarray: Feedback pattern matrix (see pattern_matrix).
+    """
+    if path is None:
+        word_length = len(words[0]) if len(words) else 5
+        path = PATTERN_MATRIX_PATH if word_length == 5 else PATTERN_MATRIX_PATH.replace('.npz', f'_{word_length}.npz')
+    patterns = None
+    if os.path.exists(path):
+        with np.load(path) as saved:
+            saved_words = list(saved['words'])
+            if saved_words == list(words):
+                return saved['patterns']
+            if saved_words and len(words) and len(saved_words[0]) == len(words[0]):
+                patterns = update_pattern_matrix(patterns=saved['patterns'], old_words=saved_words, new_words=list(words))
+    if patterns is None:
+        patterns = pattern_matrix(words=words)
+    temp_path = f'{path}.{os.getpid()}.tmp'
+    with open(temp_path, 'wb') as file:
+        np.savez(file, words=np.array(words), patterns=patterns)
+    os.replace(temp_path, path)
+    return patterns
+
+
+def _aligned(offset: int) -> int:
+    return (offset + 7) // 8 * 8
+
+
+def save_word_table(words: pd.DataFrame, path: str=WORD_TABLE_PATH, patterns: np.ndarray=None) -> None:
+    """
+    Write words to a packed binary word table that can be memory-mapped by load_word_table.
+    Write words sorted by 'wordFreq' (high to low) so load_word_data can use the mapped arrays without reordering them.
+
+    Layout (8-byte aligned sections): header (HEADER_DTYPE), column descriptors (COLUMN_DTYPE),
+    letter codes (num words x word length, uint8), each feature column (num words), 
+    and optionally the feedback pattern matrix (num words x num words).
+    The header checksum is the CRC-32 of everything after the header.
+
+    Args:
+        words (pd.DataFrame): List of words and their numeric characteristics (index is 'word').
+        path (str): Location of the word table. (Defaults to WORD_TABLE_PATH)
+        patterns (np.ndarray): Feedback pattern matrix of words to include (see pattern_matrix). (Defaults to None)
+    """
+    letters = encode_words(words.index)
+    columns = np.zeros(len(words.columns), dtype=COLUMN_DTYPE)
+    values = [np.ascontiguousarray(words[col].values) for col in words.columns]
+    for i, col in enumerate(words.columns):
+        columns[i] = (col.encode('ascii'), values[i].dtype.str.encode('ascii'))
+    sections = [columns.tobytes(), letters.tobytes()] + [column_values.tobytes() for column_values in values]
+    if patterns is not None:
+        sections.append(np.ascontiguousarray(patterns).tobytes())
+    body = b''.join(section + bytes(_aligned(len(section)) - len(section)) for section in sections)
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header[0] = (b'WRDL', WORD_TABLE_VERSION, letters.shape[1], len(words), len(columns), 
+        b'' if patterns is None else patterns.dtype.str.encode('ascii'), zlib.crc32(body), bytes(42))
+    with open(path, 'wb') as file:
+        file.write(header.tobytes())
+        file.write(body)
+
+
+def load_word_table(path: str=WORD_TABLE_PATH, verify: bool=False) -> dict:
+    """
+    Memory-map a packed word table (see save_word_table). Arrays are zero-copy views of the file,
+    so loading is near-instant and the pages are shared between processes through the page cache.
+
+    Args:
+        path (str): Location of the word table. (Defaults to WORD_TABLE_PATH)
+        verify (bool): Check the checksum, which reads the whole file. (Defaults to False)
+
+    Returns:
+        dict: {
+            'words': pd.Index, # Words, in order
+            'letters': np.ndarray, # Letter codes (see encode_words)
+            'columns': {'wordFreq': np.ndarray, etc.}, # Feature columns
+            'patterns': np.ndarray, # Feedback pattern matrix, None if not included
+            'version': int,
+            'word_length': int
+        }
+    """
+    buffer = np.memmap(path, dtype=np.uint8, mode='r')
+    header = buffer[:HEADER_DTYPE.itemsize].view(HEADER_DTYPE)[0]
+    if header['magic'] != b'WRDL' or header['version'] != WORD_TABLE_VERSION:
+        raise ValueError(f'{path} is not a version {WORD_TABLE_VERSION} word table.')
+    if verify and zlib.crc32(buffer[HEADER_DTYPE.itemsize:]) != header['checksum']:
+        raise ValueError(f'{path} failed its checksum.')
+    num_words, word_length = int(header['num_words']), int(header['word_length'])
+    offset = HEADER_DTYPE.itemsize
+    columns = buffer[offset:offset + int(header['num_columns']) * COLUMN_DTYPE.itemsize].view(COLUMN_DTYPE)
+    offset = _aligned(offset + columns.nbytes)
+    letters = buffer[offset:offset + num_words * word_length].reshape(num_words, word_length)
+    offset = _aligned(offset + letters.nbytes)
+    table = {'letters': letters, 'columns': {}, 'patterns': None, 'version': int(header['version']), 'word_length': word_length}
+    for column in columns:
+        dtype = np.dtype(column['dtype'].decode('ascii'))
+        table['columns'][column['name'].decode('ascii')] = buffer[offset:offset + num_words * dtype.itemsize].view(dtype)
+        offset = _aligned(offset + num_words * dtype.itemsize)
+    if header['pattern_dtype']:
+        dtype = np.dtype(header['pattern_dtype'].decode('ascii'))
+        table['patterns'] = buffer[offset:offset + num_words**2 * dtype.itemsize].view(dtype).reshape(num_words, num_words)
+    table['words'] = pd.Index((letters + ord('A')).view(f'S{word_length}').ravel().astype(str), name='word')
+    return table
+
+
+def load_words(path: str) -> pd.DataFrame:
+    """
+    Load a words table from a packed word table (.bin, see save_word_table) or a preprocessed CSV.
+
+    Args:
+        path (str): Location of the words table.
+
+    Returns:
+        pd.DataFrame: List of words and their characteristics (index is 'word').
+    """
+    if path.endswith('.bin'):
+        return _table_frame(table=load_word_table(path=path))
+    return pd.read_csv(path).set_index('word')
+
+
+def _table_frame(table: dict) -> pd.DataFrame:
+    # Words table backed by the memory-mapped columns of a word table, without copying them
+    return pd.DataFrame(data=table['columns'], index=table['words'], copy=False)
+
+
+def load_word_data(datapath: str) -> dict:
+    """
+    Load the words table and everything derived from it that the app and the solver service reuse for every request.
+
+    Args:
+        datapath (str): Location of the preprocessed words table (packed .bin or .csv, see load_words).
+
+    Returns:
+        dict: {
+            'data': pd.DataFrame, # Words table sorted by 'wordFreq' (index is 'word')
+            'index': WordIndex, # Letter index of data
+            'sorted_words': {'wordFreq': pd.Index, etc.}, # Words ordered (high to low) by each SORT_BY_TO_COL_MAP column
+            'patterns': np.ndarray, # Feedback pattern matrix of data (see pattern_matrix)
+            'version': str, # Checksum of data, changes whenever the words or their features do
+            'loaded_at': float # time.time() when loaded
+        }
+    """
+    table = load_word_table(path=datapath) if datapath.endswith('.bin') else None
+    raw = load_words(path=datapath) if table is None else _table_frame(table=table)
+    # A table already sorted by 'wordFreq' (see save_word_table) is used as is, keeping the memory-mapped arrays
+    in_order = raw['wordFreq'].is_monotonic_decreasing
+    data = raw if in_order else raw.sort_values(by='wordFreq', ascending=False, kind='mergesort')
+    sorted_words = {col: data.sort_values(by=col, ascending=False, kind='mergesort').index for col in SORT_BY_TO_COL_MAP.values()}
+    patterns = None if table is None else table['patterns']
+    if patterns is None:
+        patterns = load_pattern_matrix(words=list(raw.index))
+    letters = None if table is None else table['letters']
+    if not in_order:
+        # The persisted matrix and letters are in file order, reorder them to match data
+        order = raw.index.get_indexer(data.index)
+        patterns = patterns[np.ix_(order, order)]
+        letters = None if letters is None else letters[order]
+    version = f'{zlib.crc32(pd.util.hash_pandas_object(data, index=True).values.tobytes()):08x}'
+    return {'data': data, 'index': WordIndex(words=data.index, letters=letters), 'sorted_words': sorted_words, 'patterns': patterns, 
+        'version': version, 'loaded_at': time.time()}
+
+
+@profiled()
+def bucket_sizes(patterns: np.ndarray, word_length: int) -> np.ndarray:
+    """
+    Count how many potential Wordle words fall into each feedback pattern for each guess.
+
+    Args:
+        patterns (np.ndarray): Feedback pattern matrix, guesses as rows and potential Wordle words as columns.
+        word_length (int): Length of words.
+
+    Returns:
+        np.ndarray: Matrix of shape (num guesses, 3**word_length) with the size of each feedback pattern bucket.
+    """
+    num_patterns = 3**word_length
+    offsets = np.arange(patterns.shape[0], dtype=np.int64)[:, None] * num_patterns
+    flat = (patterns.astype(np.int64) + offsets).ravel()
+    return np.bincount(flat, minlength=patterns.shape[0] * num_patterns).reshape(patterns.shape[0], num_patterns)
+
+
+def expected_information(sizes: np.ndarray) -> np.ndarray:
+    """
+    Shannon entropy (bits) of each guess's feedback pattern distribution, 
+    i.e. the information a guess is expected to give when each potential Wordle word is equally likely.
+
+    Args:
+        sizes (np.ndarray): Feedback pattern bucket sizes, guesses as rows (see bucket_sizes).
+
+    Returns:
+        np.ndarray: Expected information for each guess.
+    """
+    probabilities = sizes / np.maximum(sizes.sum(axis=1, keepdims=True), 1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        terms = np.where(sizes > 0, -probabilities * np.log2(probabilities), 0.0)
+    return terms.sum(axis=1)
+
+
+def rank_expected_information(patterns: np.ndarray, candidates: np.ndarray, guesses: np.ndarray=None, word_length: int=5) -> tuple:
+    """
+    Rank guesses by the expected information of their feedback against the remaining candidates.
+    Ties go to guesses that are candidates themselves (they could be the answer), then to earlier positions.
+
+    Args:
+        patterns (np.ndarray): Feedback pattern matrix of the full words list (see pattern_matrix).
+        candidates (np.ndarray): Positions of the remaining candidate words.
+        guesses (np.ndarray): Positions of the words allowed as guesses, 
+            e.g. every word to also score words that cannot be the answer (hard mode off). (Defaults to candidates)
+        word_length (int): Length of words. (Defaults to 5)
+
+    Returns:
+        tuple: (positions of guesses ordered best first, their expected information in bits)
+    """
+    if guesses is None:
+        guesses = candidates
+    sizes = bucket_sizes(patterns=patterns[np.ix_(guesses, candidates)], word_length=word_length)
+    scores = expected_information(sizes=sizes)
+    order = np.lexsort((guesses, ~np.isin(guesses, candidates), -np.round(scores, 12)))
+    return guesses[order], scores[order]
+
+
+def bucket_size_distribution(sizes: np.ndarray) -> np.ndarray:
+    """
+    Count the feedback pattern buckets of each size for each guess.
+
+    Args:
+        sizes (np.ndarray): Feedback pattern bucket sizes, guesses as rows (see bucket_sizes).
+
+    Returns:
+        np.ndarray: Matrix of shape (num guesses, largest bucket + 1); entry [g, n] is the number of buckets of guess g holding n words
+            (empty buckets are not counted).
+    """
+    max_size = int(sizes.max(initial=0))
+    offsets = np.arange(sizes.shape[0], dtype=np.int64)[:, None] * (max_size + 1)
+    flat = (sizes.astype(np.int64) + offsets)[sizes > 0]
+    return np.bincount(flat, minlength=sizes.shape[0] * (max_size + 1)).reshape(sizes.shape[0], max_size + 1)
+
+
+def rank_worst_case(patterns: np.ndarray, candidates: np.ndarray, guesses: np.ndarray=None, word_length: int=5) -> tuple:
+    """
+    Rank guesses by their worst case: the most candidates that can remain after the guess (its largest feedback pattern bucket).
+    Ties go to guesses with more buckets, then to guesses that are candidates themselves, then to earlier positions.
+
+    Args:
+        patterns (np.ndarray): Feedback pattern matrix of the full words list (see pattern_matrix).
+        candidates (np.ndarray): Positions of the remaining candidate words.
+        guesses (np.ndarray): Positions of the words allowed as guesses. (Defaults to candidates)
+        word_length (int): Length of words. (Defaults to 5)
+
+    Returns:
+        tuple: (positions of guesses ordered best first, their largest bucket sizes, their numbers of non-empty buckets)
+    """
+    if guesses is None:
+        guesses = candidates
+    sizes = bucket_sizes(patterns=patterns[np.ix_(guesses, candidates)], word_length=word_length)
+    worst_case = sizes.max(axis=1, initial=0)
+    bucket_count = (sizes > 0).sum(axis=1)
+    order = np.lexsort((guesses, ~np.isin(guesses, candidates), -bucket_count, worst_case))
+    return guesses[order], worst_case[order], bucket_count[order]
+
+
+@profiled()
+def elr(words: pd.DataFrame, word_legnth: int, patterns: np.ndarray=None) -> pd.DataFrame:
     """
     Calculate the Expected List Reduction (see README for repo) for each word in words.
 
+    Filtering on a guess and its response retains exactly the words that would give the same response,
+    so the filtered list for each potential Wordle word is that word's feedback pattern bucket.
+    Summing the filtered list lengths over all potential Wordle words is then the sum of squared bucket sizes.
+
     Args:
         words (pd.DataFrame): List of current possible words and their characteristics (index is 'word').
         word_legnth (int): Length of words to consider.
+        patterns (np.ndarray): Precomputed feedback pattern matrix for words (see pattern_matrix). 
+            Computed if not provided. (Defaults to None)
 
     Returns:
         pd.DataFrame: words with added 'ELR' column.
     """
     tracker = words.copy()
-    tracker['ELR'] = [1.0]*len(tracker)
-    # Iterate over all potential guesses
-    for guess in tracker.index:
-        # Iterate over all potential Wordle words
-        for potential_wordle_word in tracker.index:
-            if guess != potential_wordle_word:
-                guesses = {guess: compare(guess=guess, actual=potential_wordle_word)}
-                filtered_words = filter_words(guesses=guesses, words=words, remove_previous_wordle_words=False, word_length=word_legnth)
-                tracker.loc[guess, 'ELR'] += len(filtered_words)
+    if patterns is None:
+        patterns = pattern_matrix(words=list(tracker.index))
+    sizes = bucket_sizes(patterns=patterns, word_length=word_legnth)
+    tracker['ELR'] = (sizes**2).sum(axis=1).astype(float)
     tracker['ELR'] = 1 - (tracker['ELR'] / len(words)**2)
     return tracker
 
 
-def check_convert_input(user_inputs: list):
+class SolverState:
+    """
+    Incremental filtering state for one game.
+    Caches the remaining candidates after each prefix of the guesses, so a new guess only filters
+    the words that survived the previous guesses and changing a guess only recomputes the guesses after it.
+
+    Filtering on a single guess keeps exactly the words that would give the same response (see elr),
+    so each guess is applied with one compare_batch call over the surviving candidates.
+
+    Attributes:
+        words (pd.DataFrame): List of all possible words and their characteristics (index is 'word').
+        index (WordIndex): Letter index of words.
+        word_length (int): Length of words.
+        guesses (list): [(guess, result), etc.] Guesses applied so far, in order.
+        candidates (list): Positions (in words) of the remaining candidates after each guess prefix;
+            candidates[0] is before any guess and candidates[-1] is after all of them.
+    """
+
+    def __init__(self, words: pd.DataFrame, remove_previous_wordle_words: bool=False, index: WordIndex=None):
+        self.words = words
+        self.index = index if index is not None else WordIndex(words=words.index)
+        self.word_length = self.index.letters.shape[1] if len(words) else 5
+        start = np.arange(len(words))
+        if remove_previous_wordle_words:
+            start = start[~words.index.isin(load_previous_words())]
+        self.guesses = []
+        self.candidates = [start]
+
+    def add_guess(self, guess: str, result: list) -> np.ndarray:
+        """
+        Filter the current candidates with one more guess.
+
+        Args:
+            guess (str): Wordle guess word.
+            result (list): Response from Wordle: [X,X,X,X,X] (ints: 0, 1, or 2)
+
+        Returns:
+            np.ndarray: Positions (in words) of the remaining candidates.
+        """
+        candidates = self.candidates[-1]
+        if len(guess) != self.word_length or len(result) != self.word_length:
+            raise ValueError(f'Guess {guess} and its feedback must be {self.word_length} letters long.')
+        if len(candidates):
+            # Letter counts and the repeated letter flag come from the index instead of being recomputed for every guess
+            position = self.index.words.get_indexer([guess])[0]
+            codes = compare_batch(guesses=guess, actuals=self.index.letters[candidates], 
+                guess_repeats=None if position < 0 else self.index.repeats[position:position+1], actual_counts=self.index.counts[candidates])
+            candidates = candidates[codes == encode_result(result)]
+        self.guesses.append((guess, list(result)))
+        self.candidates.append(candidates)
+        return candidates
+
+    def set_guesses(self, guesses: dict) -> np.ndarray:
+        """
+        Update the state to guesses, reusing the cached candidates for the longest unchanged prefix.
+
+        Args:
+            guesses (dict): {
+                'word1':[X,X,X,X,X],
+                'word2':[X,X,X,X,X],
+                etc.
+                } # Guesses and feedback in the order they were made (see filter_words)
+
+        Returns:
+            np.ndarray: Positions (in words) of the remaining candidates.
+        """
+        guesses = [(guess, list(result)) for guess, result in guesses.items()]
+        num_kept = 0
+        while num_kept < min(len(guesses), len(self.guesses)) and guesses[num_kept] == self.guesses[num_kept]:
+            num_kept += 1
+        del self.guesses[num_kept:]
+        del self.candidates[num_kept+1:]
+        for guess, result in guesses[num_kept:]:
+            self.add_guess(guess=guess, result=result)
+        return self.candidates[-1]
+
+    def remaining(self) -> pd.DataFrame:
+        """
+        Returns:
+            pd.DataFrame: Remaining candidate words and their characteristics, in the order of words.
+        """
+        return self.words.iloc[self.candidates[-1]]
+
+
+def rank_multi_board(patterns: np.ndarray, boards: list, guesses: np.ndarray=None, word_length: int=5) -> tuple:
+    """
+    Rank guesses for a multi-board game (one guess is played on every board at once, e.g. Quordle)
+    by their combined Expected List Reduction (see elr) over the boards' remaining candidates.
+    Bucket sizes for every guess on every board come from a single bincount, offsetting each board's codes.
+    Boards without candidates (solved) add nothing.
+    Ties go to guesses that are candidates on some board, then to earlier positions.
+
+    Args:
+        patterns (np.ndarray): Feedback pattern matrix of the full words list (see pattern_matrix).
+        boards (list): [candidates1, candidates2, etc.] Positions of the remaining candidate words on each board.
+        guesses (np.ndarray): Positions of the words allowed as guesses. (Defaults to every word)
+        word_length (int): Length of words. (Defaults to 5)
+
+    Returns:
+        tuple: (positions of guesses ordered best first, their summed ELR over the boards)
+    """
+    if guesses is None:
+        guesses = np.arange(patterns.shape[0])
+    num_patterns = 3**word_length
+    lengths = np.array([len(candidates) for candidates in boards], dtype=np.int64)
+    columns = np.concatenate([np.asarray(candidates, dtype=np.int64) for candidates in boards] + [np.zeros(0, dtype=np.int64)])
+    board_offsets = np.repeat(np.arange(len(boards), dtype=np.int64) * num_patterns, lengths)
+    row_offsets = np.arange(len(guesses), dtype=np.int64)[:, None] * (len(boards) * num_patterns)
+    flat = (patterns[np.ix_(guesses, columns)].astype(np.int64) + board_offsets + row_offsets).ravel()
+    sizes = np.bincount(flat, minlength=len(guesses) * len(boards) * num_patterns).reshape(len(guesses), len(boards), num_patterns)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        reductions = np.where(lengths > 0, 1 - (sizes.astype(np.int64)**2).sum(axis=2) / np.maximum(lengths, 1)**2, 0.0)
+    scores = reductions.sum(axis=1)
+    order = np.lexsort((guesses, ~np.isin(guesses, columns), -np.round(scores, 12)))
+    return guesses[order], scores[order]
+
+
+class MultiBoardState:
+    """
+    Filtering state for a multi-board game (e.g. Quordle), where each guess is played on every board
+    and gets one feedback row per board. Keeps one SolverState (candidate set) per board.
+
+    Attributes:
+        boards (list): SolverState of each board.
+        solved (list): Whether each board has been solved; later feedback for a solved board is ignored.
+    """
+
+    def __init__(self, words: pd.DataFrame, num_boards: int, remove_previous_wordle_words: bool=False, index: WordIndex=None):
+        index = index if index is not None else WordIndex(words=words.index)
+        self.boards = [SolverState(words=words, remove_previous_wordle_words=remove_previous_wordle_words, index=index) for _ in range(num_boards)]
+        self.solved = [False] * num_boards
+
+    def add_guess(self, guess: str, results: list) -> list:
+        """
+        Filter every unsolved board with one more guess.
+
+        Args:
+            guess (str): Guess word, played on every board.
+            results (list): [[X,X,X,X,X], etc.] Response of each board (ints: 0, 1, or 2)
+
+        Returns:
+            list: Positions (in words) of the remaining candidates on each board.
+        """
+        if len(results) != len(self.boards):
+            raise ValueError(f'Guess {guess} needs feedback for each of the {len(self.boards)} boards.')
+        for board, result in enumerate(results):
+            if not self.solved[board]:
+                self.boards[board].add_guess(guess=guess, result=result)
+                self.solved[board] = all(x == 2 for x in result)
+        return self.candidates()
+
+    def set_guesses(self, guesses: dict) -> list:
+        """
+        Update the state to guesses, reusing each board's cached candidates for the longest unchanged prefix.
+
+        Args:
+            guesses (dict): {
+                'word1':[[X,X,X,X,X], [X,X,X,X,X], etc.], # One response per board
+                'word2':[[X,X,X,X,X], [X,X,X,X,X], etc.],
+                etc.
+                } # Guesses in the order they were made
+
+        Returns:
+            list: Positions (in words) of the remaining candidates on each board.
+        """
+        for results in guesses.values():
+            if len(results) != len(self.boards):
+                raise ValueError(f'Each guess needs feedback for each of the {len(self.boards)} boards.')
+        for board, state in enumerate(self.boards):
+            # A board stops taking feedback once it is solved
+            board_guesses = {}
+            for guess, results in guesses.items():
+                board_guesses[guess] = results[board]
+                if all(x == 2 for x in results[board]):
+                    break
+            state.set_guesses(guesses=board_guesses)
+            self.solved[board] = bool(state.guesses) and all(x == 2 for x in state.guesses[-1][1])
+        return self.candidates()
+
+    def candidates(self) -> list:
+        """
+        Returns:
+            list: Positions (in words) of the remaining candidates on each board, empty for solved boards.
+        """
+        return [np.zeros(0, dtype=np.int64) if solved else state.candidates[-1] for state, solved in zip(self.boards, self.solved)]
+
+
+class SubsetCache:
+    """
+    Bounded LRU cache of results derived from a candidate subset (e.g. the best guess for it),
+    keyed by a bitset of the surviving word positions so the same subset reached through different
+    guesses and feedback shares one entry.
+
+    Attributes:
+        num_words (int): Number of words in the full list the positions refer to.
+        max_entries (int): Maximum number of entries, None for no limit.
+        max_bytes (int): Approximate maximum memory used by keys and values, None for no limit.
+        hits (int): Lookups that found an entry.
+        misses (int): Lookups that did not.
+        evictions (int): Entries dropped to stay within the limits.
+        nbytes (int): Approximate memory currently used by keys and values.
+    """
+
+    def __init__(self, num_words: int, max_entries: int=None, max_bytes: int=64*2**20):
+        self.num_words = num_words
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, candidates: np.ndarray) -> bytes:
+        """
+        Args:
+            candidates (np.ndarray): Positions of the candidate words, in any order.
+
+        Returns:
+            bytes: Canonical bitset of the candidates (num_words / 8 bytes).
+        """
+        mask = np.zeros(self.num_words, dtype=bool)
+        mask[candidates] = True
+        return np.packbits(mask).tobytes()
+
+    def get(self, key: bytes, default=None):
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+        self.misses += 1
+        return default
+
+    def put(self, key: bytes, value) -> None:
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        size = len(key) + self._sizeof(value)
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self._entries and ((self.max_entries is not None and len(self._entries) > self.max_entries) 
+                or (self.max_bytes is not None and self.nbytes > self.max_bytes)):
+            self.nbytes -= self._entries.popitem(last=False)[1][1]
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: {'hits', 'misses', 'evictions', 'entries', 'bytes', 'hitRate'}
+        """
+        lookups = self.hits + self.misses
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions, 'entries': len(self._entries),
+            'bytes': self.nbytes, 'hitRate': self.hits / lookups if lookups else 0.0}
+
+    @staticmethod
+    def _sizeof(value) -> int:
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, (tuple, list)):
+            return sys.getsizeof(value) + sum(SubsetCache._sizeof(item) for item in value)
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True).sum())
+        return sys.getsizeof(value)
+
+
+class ResultStore:
+    """
+    On-disk cache of ranked suggestions keyed by game state, shared by every session and process using the same file.
+    Backed by SQLite in WAL mode, so readers never block each other or a writer and writers wait for each other.
+
+    Attributes:
+        path (str): Location of the SQLite database.
+        max_suggestions (int): Most suggestions stored per game state.
+        hits (int): Lookups in this process that found an entry.
+        misses (int): Lookups in this process that did not.
+        latencies (deque): Seconds taken by recent lookups in this process.
+    """
+
+    def __init__(self, path: str=RESULT_STORE_PATH, max_suggestions: int=100, timeout: float=30.0):
+        self.path = path
+        self.max_suggestions = max_suggestions
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.latencies = deque(maxlen=10000)
+        self._local = threading.local()
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        # One connection per thread (e.g. each Streamlit session's script thread) and per process, 
+        # connections must not be shared between threads or with forked children
+        local = self._local
+        if getattr(local, 'connection', None) is None or local.pid != os.getpid():
+            local.connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            local.connection.execute('PRAGMA journal_mode=WAL')
+            local.connection.execute('PRAGMA synchronous=NORMAL')
+            local.connection.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, suggestions TEXT NOT NULL, remaining INTEGER NOT NULL, '
+                'truncated INTEGER NOT NULL, created REAL NOT NULL)')
+            local.pid = os.getpid()
+        return local.connection
+
+    @staticmethod
+    def key(guesses: dict, remove_previous_words: bool, sort_by: str, data_version: str, options: dict=None) -> str:
+        """
+        Canonical hash of a game state. Guesses are sorted, since the remaining words do not depend on their order.
+        With remove_previous_words the version of the previous words snapshot (see previous_words_version) is included, 
+        so entries stored before the snapshot is refreshed are not used.
+
+        Args:
+            guesses (dict): {'word1':[X,X,X,X,X], etc.} Guesses and feedback (see filter_words).
+            remove_previous_words (bool): Remove previously used Wordle words from suggested words list.
+            sort_by (str): How suggestions are sorted (see rank_suggestions).
+            data_version (str): Version of the words table (see load_word_data).
+            options (dict): Any other settings the suggestions depend on, e.g. {'hardMode': True}. (Defaults to None)
+
+        Returns:
+            str: SHA-256 hex digest.
+        """
+        state = {'guesses': sorted([guess, [int(x) for x in result]] for guess, result in guesses.items()), 
+            'removePreviousWords': bool(remove_previous_words), 'sortBy': sort_by, 'dataVersion': data_version, 'options': options or {}}
+        if remove_previous_words:
+            state['previousWordsVersion'] = previous_words_version()
+        return hashlib.sha256(json.dumps(state, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+    def get(self, key: str, num_words: int=0) -> tuple:
+        """
+        Args:
+            key (str): Game state hash (see key).
+            num_words (int): Number of suggestions needed; entries holding fewer (truncated) count as missing. (Defaults to 0)
+
+        Returns:
+            tuple: (ranked suggestions, number of remaining words), None if not stored.
+        """
+        start = time.perf_counter()
+        row = self.connection.execute('SELECT suggestions, remaining, truncated FROM results WHERE key = ?', (key,)).fetchone()
+        result = None
+        if row is not None:
+            suggestions = json.loads(row[0])
+            if not row[2] or num_words <= len(suggestions):
+                result = (suggestions, row[1])
+        self.latencies.append(time.perf_counter() - start)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: str, suggestions: list, remaining: int) -> None:
+        """
+        Args:
+            key (str): Game state hash (see key).
+            suggestions (list): Ranked suggestions, only the first max_suggestions are stored.
+            remaining (int): Number of remaining words.
+        """
+        truncated = len(suggestions) > self.max_suggestions
+        self.connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)', 
+            (key, json.dumps(list(suggestions[:self.max_suggestions])), int(remaining), int(truncated), time.time()))
+
+    def put_many(self, entries: list) -> None:
+        """
+        Store many results in one transaction.
+
+        Args:
+            entries (list): [(key, suggestions, remaining), etc.]
+        """
+        rows = [(key, json.dumps(list(suggestions[:self.max_suggestions])), int(remaining), int(len(suggestions) > self.max_suggestions), time.time())
+            for key, suggestions, remaining in entries]
+        with self.connection:
+            self.connection.execute('BEGIN')
+            self.connection.executemany('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)', rows)
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def stats(self) -> dict:
+        """
+        Returns:
+            dict: {'hits', 'misses', 'hitRate', 'entries', 'latencyMs': {'p50', 'p90', 'p99'}} # Lookups in this process
+        """
+        lookups = self.hits + self.misses
+        latencies = np.array(self.latencies) * 1000 if self.latencies else np.zeros(1)
+        return {'hits': self.hits, 'misses': self.misses, 'hitRate': self.hits / lookups if lookups else 0.0, 'entries': len(self),
+            'latencyMs': {f'p{p}': float(np.percentile(latencies, p)) for p in [50, 90, 99]}}
+
+
+def suggestion_guesses(words: dict, guesses: dict, hard_mode: bool=False, score_all_words: bool=False) -> np.ndarray:
+    """
+    Words that may be suggested when ranking by a score (Expected Information or Worst Case).
+
+    Args:
+        words (dict): Loaded data (see load_word_data).
+        guesses (dict): {'word1':[X,X,X,X,X], etc.} Guesses and feedback (see filter_words).
+        hard_mode (bool): Only words using every revealed hint (see CompiledKnowns). (Defaults to False)
+        score_all_words (bool): Every word, including words that cannot be the answer (hard mode off). (Defaults to False)
+
+    Returns:
+        np.ndarray: Positions (in words['data']) of the words to score, None for only the remaining words.
+    """
+    if hard_mode and guesses:
+        knowns = get_knowns(guesses=guesses, word_length=words['index'].letters.shape[1])
+        return CompiledKnowns(knowns=knowns).evaluate(index=words['index'])[0]
+    if score_all_words:
+        return np.arange(len(words['data']))
+    return None
+
+
+def rank_suggestions(words: dict, candidates: np.ndarray, sort_by: str, guesses: np.ndarray=None) -> pd.Index:
+    """
+    Order the words to suggest by the desired metric.
+
+    Args:
+        words (dict): Loaded data (see load_word_data).
+        candidates (np.ndarray): Positions (in words['data']) of the remaining words.
+        sort_by (str): How suggestions should be sorted. Supported options:
+            'Word Frequency', 
+            'Letter Frequency', 
+            'Letter at Position Frequency' (remaining words, high to low),
+            'Expected Information' (see rank_expected_information),
+            'Worst Case' (see rank_worst_case)
+        guesses (np.ndarray): Positions of the words to score for Expected Information and Worst Case (see suggestion_guesses). 
+            (Defaults to candidates)
+
+    Returns:
+        pd.Index: Suggested words, best first.
+    """
+    word_length = words['index'].letters.shape[1]
+    if sort_by == 'Expected Information':
+        ranked_guesses, _ = rank_expected_information(patterns=words['patterns'], candidates=candidates, guesses=guesses, word_length=word_length)
+        return words['data'].index[ranked_guesses]
+    if sort_by == 'Worst Case':
+        ranked_guesses, _, _ = rank_worst_case(patterns=words['patterns'], candidates=candidates, guesses=guesses, word_length=word_length)
+        return words['data'].index[ranked_guesses]
+    sorted_words = words['sorted_words'][SORT_BY_TO_COL_MAP[sort_by]]
+    return sorted_words[sorted_words.isin(words['data'].index[candidates])]
+
+
+def walk_decision_tree(tree: dict, guesses: dict) -> str:
+    """
+    Find the next guess of a saved guessing policy (see solve_tree.py) by following the guesses made so far.
+
+    Args:
+        tree (dict): {
+            'g': 'WORD1', # Guess to make
+            'c': {
+                '120': {'g': 'WORD2', 'c': {...}}, # Subtree for each feedback code (see encode_result)
+                etc.
+            }
+        }
+        guesses (dict): {
+            'word1':[X,X,X,X,X],
+            'word2':[X,X,X,X,X],
+            etc.
+            } # Guesses and feedback in the order they were made (see filter_words)
+
+    Returns:
+        str: Next guess, or None if the guesses left the tree or the word is already solved.
+    """
+    node = tree
+    for guess, result in guesses.items():
+        if node['g'] != guess:
+            return None
+        node = node['c'].get(str(encode_result(result)))
+        if node is None:
+            return None
+    return node['g']
+
+
+def check_convert_input(user_inputs: list, word_length: int=5):
     """
     Check input for erroneous formatting.
     If input is clean, convert it to more useful format.
@@ -322,6 +1592,7 @@ def check_convert_input(user_inputs: list):
             'word2':'XXXXX',
             etc.
         }
+        word_length (int): Length of words. (Defaults to 5)
 
     Returns:
         guesses (dict): {
@@ -334,7 +1605,7 @@ def check_convert_input(user_inputs: list):
     guesses = {}
     bad_input = False
     for user_input in user_inputs:
-        if re.match(pattern='[A-Z]{5}[-][0-2]{5}', string=user_input):
+        if re.match(pattern=f'[A-Z]{{{word_length}}}[-][0-2]{{{word_length}}}', string=user_input):
             guesses[user_input.split('-')[0]] = [int(x) for x in list(user_input.split('-')[1])]
         else:
             bad_input = True
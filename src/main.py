@@ -1,27 +1,94 @@
 import streamlit as st
 import pandas as pd
+import json
+import numpy as np
+import os
+import time
+import profiling
 from helper_methods import *
 
 
-def suggest(df: pd.DataFrame, original_length: int, num_words_to_display: int, sort_by: str) -> None:
+@st.experimental_singleton
+def load_data(datapath: str, mtime: float) -> dict:
     """
-    Print the suggested words nicely and ordered by the desired metric.
+    Load the words table and everything derived from it once (see load_word_data), shared across reruns and sessions.
+    The cache is keyed on the data file's modification time, so it is only rebuilt when the file changes.
 
     Args:
-        df (pd.DataFrame): Remaining words.
+        datapath (str): Location of the preprocessed words table (packed .bin or .csv, see load_words).
+        mtime (float): Modification time of datapath (cache key only).
+
+    Returns:
+        dict: Loaded data (see load_word_data).
+    """
+    return load_word_data(datapath=datapath)
+
+
+@st.experimental_singleton
+def load_decision_tree(path: str, mtime: float) -> dict:
+    """
+    Load the saved guessing policy (see solve_tree.py) once, shared across reruns and sessions.
+
+    Args:
+        path (str): Location of the decision tree.
+        mtime (float): Modification time of path (cache key only).
+
+    Returns:
+        dict: {
+            'word_length': int, # Length of the words the tree was built for
+            'version': str, # Version of the words table the tree was built from (see load_word_data)
+            'tree': dict # Decision tree (see walk_decision_tree)
+        }
+    """
+    with open(path, 'r') as file:
+        return json.load(file)
+
+
+@st.experimental_singleton
+def load_result_store(path: str) -> ResultStore:
+    """
+    Open the persistent suggestions cache (see ResultStore) once, shared across reruns and sessions.
+
+    Args:
+        path (str): Location of the SQLite database.
+
+    Returns:
+        ResultStore: Suggestions cache.
+    """
+    return ResultStore(path=path)
+
+
+def get_solver(words: dict, remove_previous_words: bool) -> SolverState:
+    """
+    Get this session's incremental filtering state, starting a new one when the data or options change.
+
+    Args:
+        words (dict): Loaded data (see load_data).
+        remove_previous_words (bool): Remove previously used Wordle words from suggested words list.
+
+    Returns:
+        SolverState: Filtering state for this session.
+    """
+    key = (words['loaded_at'], remove_previous_words)
+    if st.session_state.get('solver_key') != key:
+        st.session_state['solver'] = SolverState(words=words['data'], remove_previous_wordle_words=remove_previous_words, index=words['index'])
+        st.session_state['solver_key'] = key
+    return st.session_state['solver']
+
+
+def suggest(suggestions: list, num_remaining: int, original_length: int, num_words_to_display: int) -> None:
+    """
+    Print the suggested words nicely.
+
+    Args:
+        suggestions (list): Suggested words, best first (see rank_suggestions).
+        num_remaining (int): Number of remaining words.
         original_length (int): Original number of words.
         num_words_to_display (int): Number of words to display.
-        sort_by (str): How suggestions should be sorted. Supported options:
-            'Word Frequency', 
-            'Letter Frequency', 
-            'Letter at Position Frequency'
     """
-    sort_by_to_col_map = {'Word Frequency': 'wordFreq', 'Letter Frequency': 'letterFreqSum', 'Letter at Position Frequency': 'letterPosFreqSum'}
-    sort_by_col = sort_by_to_col_map[sort_by]
-    df = df.sort_values(by=sort_by_col, ascending=False)
-    st.write(f'Words Remaining: {len(df)} ({len(df)*100/original_length:.2f}%)')
-    for i in range(min(num_words_to_display, len(df))):
-        st.markdown(f"<div style='text-align: center'> {df.iloc[i].name} </div>", unsafe_allow_html=True)
+    st.write(f'Words Remaining: {num_remaining} ({num_remaining*100/original_length:.2f}%)')
+    for i in range(min(num_words_to_display, len(suggestions))):
+        st.markdown(f"<div style='text-align: center'> {suggestions[i]} </div>", unsafe_allow_html=True)
     return
 
 
@@ -32,13 +99,21 @@ def main():
     )
     num_words_to_display = int(st.sidebar.number_input(label='Number of words to suggest', min_value=0, value=10))
     remove_previous_words = st.sidebar.radio(label='Remove previously used Wordle words?', options=['Yes', 'No'], index=1) == 'Yes'
-    sort_by = st.sidebar.radio(label='Sort suggested words (high to low) by', options=['Word Frequency', 'Letter Frequency', 'Letter at Position Frequency'], index=1)
+    sort_by = st.sidebar.radio(label='Sort suggested words (high to low) by', options=['Word Frequency', 'Letter Frequency', 'Letter at Position Frequency', 'Expected Information', 'Worst Case'], index=1)
+    score_all_words = st.sidebar.checkbox(label='Expected Information and Worst Case: also suggest words that cannot be the answer (hard mode off)', value=False)
+    hard_mode = st.sidebar.checkbox(label='Hard mode: only suggest words that use every revealed hint', value=False)
 
     # Get Data
-    datapath = 'Data-Preprocessed/word_freq.csv'
+    datapath = WORD_TABLE_PATH if os.path.exists(WORD_TABLE_PATH) else 'Data-Preprocessed/word_freq.csv'
     # datapath = 'https://raw.githubusercontent.com/middlec000/wordler/main/Data-Preprocessed/word_freq_wordle_only.csv'
-    data = pd.read_csv(datapath).sort_values(by='wordFreq', ascending=False).set_index('word')
+    start = time.time()
+    words = load_data(datapath=datapath, mtime=os.path.getmtime(datapath))
+    if profiling.ENABLED:
+        # Shown in the profiling expander
+        profiling.record(stage=f'load_data ({"cold" if words["loaded_at"] >= start else "warm"})', seconds=time.time()-start)
+    data = words['data']
     original_length = len(data)
+    word_length = words['index'].letters.shape[1]
     
     # User Instructions
     st.write('# The Wordler')
@@ -48,7 +123,7 @@ def main():
         st.write('Wordle website: [https://www.nytimes.com/games/wordle/index.html](https://www.nytimes.com/games/wordle/index.html)')
         st.write('Enter Wordle feedback according to the following mapping:\n* Gray -> 0\n* Yellow -> 1\n* Green -> 2')
         st.write('Example Entry: hello-10112')
-        st.write('Enter each of your five letter Wordle guesses, a dash (-), then the feedback you get from Wordle in the text boxes below:')
+        st.write(f'Enter each of your {word_length} letter Wordle guesses, a dash (-), then the feedback you get from Wordle in the text boxes below:')
         st.write('Open the sidebar (upper left >) for additional options.')
         st.write('See the GitHub repo for the code and how calculations are performed: \n[https://github.com/middlec000/wordler](https://github.com/middlec000/wordler)')
 
@@ -56,21 +131,51 @@ def main():
     user_inputs = []
     # Get user input
     for i in range(1,7):
-        user_input = st.text_input(label=f'Word{i}-XXXXX',value='', max_chars=11).upper()
+        user_input = st.text_input(label=f'Word{i}-{"X"*word_length}',value='', max_chars=2*word_length+1).upper()
         if user_input:
             user_inputs.append(user_input)
     
     st.write('## Words Suggested by Wordler:')
     # Check User Input
-    guesses, bad_input = check_convert_input(user_inputs=user_inputs)
+    guesses, bad_input = check_convert_input(user_inputs=user_inputs, word_length=word_length)
     if bad_input:
         st.warning('Input is invalid - please see example above.')
+    # Suggestions for popular game states are usually already in the result store
+    store = load_result_store(path=RESULT_STORE_PATH)
+    key = ResultStore.key(guesses=guesses if not bad_input else {}, remove_previous_words=remove_previous_words, sort_by=sort_by, 
+        data_version=words['version'], options={'scoreAllWords': score_all_words, 'hardMode': hard_mode})
+    cached = store.get(key=key, num_words=num_words_to_display)
+    # Best next guess from the saved guessing policy, a walk down the tree instead of filtering and sorting.
+    # The tree only applies to the words table it was built from, with every word allowed as a guess and as the answer
+    if os.path.exists(DECISION_TREE_PATH) and not bad_input and not hard_mode and not remove_previous_words:
+        saved_tree = load_decision_tree(path=DECISION_TREE_PATH, mtime=os.path.getmtime(DECISION_TREE_PATH))
+        if saved_tree.get('word_length') == word_length and saved_tree.get('version') == words['version']:
+            best_guess = walk_decision_tree(tree=saved_tree['tree'], guesses=guesses)
+            if best_guess:
+                st.write(f'Best next guess (decision tree): **{best_guess}**')
     # Display (Filtered) Words
-    if guesses and not bad_input:
-        filtered_data = filter_words(guesses=guesses, words=data, remove_previous_wordle_words=remove_previous_words)
-        suggest(df=filtered_data, original_length=original_length, num_words_to_display=num_words_to_display, sort_by=sort_by)
+    if cached is not None:
+        suggestions, num_remaining = cached
     else:
-        suggest(df=data, original_length=original_length, num_words_to_display=num_words_to_display, sort_by=sort_by)
+        if guesses and not bad_input:
+            solver = get_solver(words=words, remove_previous_words=remove_previous_words)
+            candidates = solver.set_guesses(guesses=guesses)
+        else:
+            candidates = np.arange(len(data))
+        # Words to score: the remaining words, every word, or in hard mode every word using the revealed hints
+        score_guesses = suggestion_guesses(words=words, guesses=guesses if not bad_input else {}, hard_mode=hard_mode, score_all_words=score_all_words)
+        suggestions = list(rank_suggestions(words=words, candidates=candidates, sort_by=sort_by, guesses=score_guesses))
+        num_remaining = len(candidates)
+        store.put(key=key, suggestions=suggestions, remaining=num_remaining)
+    suggest(suggestions=suggestions, num_remaining=num_remaining, original_length=original_length, num_words_to_display=num_words_to_display)
+
+    with st.sidebar.expander('Result store'):
+        st.write(store.stats())
+
+    # Hot path timings, only when run with WORDLER_PROFILE=1
+    if profiling.ENABLED:
+        with st.expander('DEBUG: Profiling'):
+            st.table(pd.DataFrame(profiling.report()).T)
     return
 
 if __name__ == '__main__':
@@ -0,0 +1,151 @@
+import atexit
+import functools
+import inspect
+import numpy as np
+import os
+import sys
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Opt in with WORDLER_PROFILE=1 or the profiling() context manager
+ENABLED = os.environ.get('WORDLER_PROFILE', '0') not in ('', '0')
+# Durations kept per stage for percentiles
+MAX_SAMPLES = 100000
+STATS = {}
+
+
+def _rows(value):
+    # Number of rows in a words table or retained by a boolean mask, None for anything else
+    if isinstance(value, np.ndarray):
+        return int(np.count_nonzero(value)) if value.dtype == bool else len(value)
+    if hasattr(value, 'index') and hasattr(value, 'columns'):
+        return len(value)
+    return None
+
+
+def record(stage: str, seconds: float, rows_in: int=None, rows_out: int=None) -> None:
+    """
+    Record one call of a stage.
+
+    Args:
+        stage (str): Stage name.
+        seconds (float): Duration of the call.
+        rows_in (int): Words going into the stage, if known. (Defaults to None)
+        rows_out (int): Words left after the stage, if known. (Defaults to None)
+    """
+    stats = STATS.get(stage)
+    if stats is None:
+        stats = STATS[stage] = {'calls': 0, 'seconds': 0.0, 'rowsIn': 0, 'rowsOut': 0, 'samples': deque(maxlen=MAX_SAMPLES)}
+    stats['calls'] += 1
+    stats['seconds'] += seconds
+    stats['samples'].append(seconds)
+    if rows_in is not None:
+        stats['rowsIn'] += rows_in
+    if rows_out is not None:
+        stats['rowsOut'] += rows_out
+
+
+def profiled(stage: str=None, rows_arg: str='words'):
+    """
+    Decorator recording call counts, timings and rows in/out of a function while profiling is enabled.
+    When disabled the only overhead is one flag check per call.
+
+    Args:
+        stage (str): Stage name. (Defaults to the function name)
+        rows_arg (str): Argument holding the words going in, a DataFrame or boolean mask. (Defaults to 'words')
+
+    Returns:
+        Decorated function.
+    """
+    def decorator(func):
+        name = stage or func.__name__
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return func(*args, **kwargs)
+            bound = signature.bind_partial(*args, **kwargs).arguments
+            rows_in = _rows(bound[rows_arg]) if rows_arg in bound else None
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            record(stage=name, seconds=time.perf_counter() - start, rows_in=rows_in, rows_out=_rows(result))
+            return result
+        return wrapper
+    return decorator
+
+
+@contextmanager
+def profiling():
+    """
+    Enable profiling inside a with block.
+    """
+    global ENABLED
+    previous, ENABLED = ENABLED, True
+    try:
+        yield STATS
+    finally:
+        ENABLED = previous
+
+
+def collect() -> dict:
+    """
+    Take the stats recorded so far and reset them, e.g. to send a worker's stats to the parent process.
+
+    Returns:
+        dict: Recorded stats (see merge).
+    """
+    global STATS
+    stats, STATS = STATS, {}
+    return stats
+
+
+def merge(stats: dict) -> None:
+    """
+    Add stats collected in another process (see collect).
+
+    Args:
+        stats (dict): Recorded stats.
+    """
+    for stage, other in stats.items():
+        own = STATS.setdefault(stage, {'calls': 0, 'seconds': 0.0, 'rowsIn': 0, 'rowsOut': 0, 'samples': deque(maxlen=MAX_SAMPLES)})
+        for key in ['calls', 'seconds', 'rowsIn', 'rowsOut']:
+            own[key] += other[key]
+        own['samples'].extend(other['samples'])
+
+
+def report() -> dict:
+    """
+    Returns:
+        dict: {
+            'filter_words': {'calls', 'totalMs', 'meanMs', 'p50Ms', 'p90Ms', 'p99Ms', 'rowsIn', 'rowsOut'},
+            etc.
+        } # Stages ordered by total time (high to low)
+    """
+    summary = {}
+    for stage, stats in sorted(STATS.items(), key=lambda item: -item[1]['seconds']):
+        samples = np.array(stats['samples']) * 1000
+        summary[stage] = {'calls': stats['calls'], 'totalMs': stats['seconds'] * 1000, 'meanMs': stats['seconds'] * 1000 / stats['calls'],
+            'p50Ms': float(np.percentile(samples, 50)), 'p90Ms': float(np.percentile(samples, 90)), 'p99Ms': float(np.percentile(samples, 99)),
+            'rowsIn': stats['rowsIn'], 'rowsOut': stats['rowsOut']}
+    return summary
+
+
+def format_report() -> str:
+    """
+    Returns:
+        str: report() as a text table.
+    """
+    lines = [f'{"stage":<32}{"calls":>10}{"total ms":>12}{"mean ms":>10}{"p50 ms":>10}{"p90 ms":>10}{"p99 ms":>10}{"rows in":>12}{"rows out":>12}']
+    for stage, stats in report().items():
+        lines.append(f'{stage:<32}{stats["calls"]:>10}{stats["totalMs"]:>12.2f}{stats["meanMs"]:>10.4f}{stats["p50Ms"]:>10.4f}{stats["p90Ms"]:>10.4f}'
+            f'{stats["p99Ms"]:>10.4f}{stats["rowsIn"]:>12}{stats["rowsOut"]:>12}')
+    return '\n'.join(lines)
+
+
+@atexit.register
+def _dump_report() -> None:
+    if STATS:
+        print(f'Profile (pid {os.getpid()}):\n{format_report()}', file=sys.stderr)
@@ -0,0 +1,44 @@
+import numpy as np
+import os
+import pytest
+from src.helper_methods import compare, compare_batch, encode_result, load_words
+
+WORDS = list(load_words(path=os.path.join(os.path.dirname(__file__), '..', 'Data-Preprocessed', 'word_freq.csv')).index)
+
+# Guess/actual pairs with double and triple letters on either side
+REPEATED_LETTER_PAIRS = [
+    ('SPEED', 'ABIDE'), ('ABIDE', 'SPEED'), ('SPEED', 'ERASE'), ('ERASE', 'SPEED'),
+    ('LLAMA', 'HELLO'), ('HELLO', 'LLAMA'), ('ALLOW', 'LOYAL'), ('LOYAL', 'ALLOW'),
+    ('EERIE', 'THREE'), ('THREE', 'EERIE'), ('EERIE', 'EERIE'), ('EERIE', 'CREPE'),
+    ('MAMMA', 'MAXIM'), ('MAXIM', 'MAMMA'), ('GEESE', 'EGRET'), ('SISSY', 'ASSES'),
+    ('BOBBY', 'BLOBS'), ('KAYAK', 'ALPHA'), ('EERIE', 'QUEUE'), ('NANNY', 'ANNEX'),
+]
+
+
+def test_all_pairs_match_compare():
+    # Every guess against every actual word of the words table
+    codes = compare_batch(guesses=WORDS, actuals=WORDS)
+    expected = np.array([[encode_result(compare(guess=guess, actual=actual)) for actual in WORDS] for guess in WORDS])
+    assert codes.shape == (len(WORDS), len(WORDS))
+    assert (codes == expected).all(), f'{(codes != expected).sum()} mismatches'
+
+
+@pytest.mark.parametrize('guess, actual', REPEATED_LETTER_PAIRS)
+def test_repeated_letters_match_compare(guess, actual):
+    assert compare_batch(guesses=guess, actuals=actual) == encode_result(compare(guess=guess, actual=actual))
+
+
+def test_single_guess_shape():
+    codes = compare_batch(guesses='CRANE', actuals=WORDS[:10])
+    assert codes.shape == (10,)
+    assert list(codes) == [encode_result(compare(guess='CRANE', actual=actual)) for actual in WORDS[:10]]
+
+
+def test_single_pair_shape():
+    code = compare_batch(guesses='CRANE', actuals='SHARD')
+    assert np.ndim(code) == 0
+    assert code == encode_result(compare(guess='CRANE', actual='SHARD'))
+
+
+def test_list_shape():
+    assert compare_batch(guesses=['CRANE', 'SLATE'], actuals=WORDS[:7]).shape == (2, 7)
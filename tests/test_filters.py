@@ -0,0 +1,66 @@
+import numpy as np
+import os
+import pytest
+from collections import Counter
+from benchmark_filters import filter_regex, get_states
+from src.helper_methods import CompiledKnowns, SolverState, WordIndex, compare, filter_words, get_knowns, load_words
+
+WORDS_TABLE = load_words(path=os.path.join(os.path.dirname(__file__), '..', 'Data-Preprocessed', 'word_freq.csv'))
+WORDS = list(WORDS_TABLE.index)
+INDEX = WordIndex(words=WORDS_TABLE.index)
+MAX_COUNTS = INDEX.counts.max(axis=1)
+
+# Random game states, plus states with repeated letters in the answer or the guesses
+STATES = (get_states(words=WORDS, num_states=100, seed=0)
+    + get_states(words=WORDS, num_states=50, seed=1, answers=[word for word, count in zip(WORDS, MAX_COUNTS) if count >= 2])
+    + get_states(words=WORDS, num_states=50, seed=2, guess_words=[word for word, count in zip(WORDS, MAX_COUNTS) if count >= 2]))
+
+
+def consistent_words(guesses: dict) -> list:
+    # Words giving the same response to every guess
+    return [word for word in WORDS if all(compare(guess=guess, actual=word) == result for guess, result in guesses.items())]
+
+def hard_mode_legal(guesses: dict) -> list:
+    # Words keeping every green letter in place and using at least as many of each letter as the hints revealed
+    exact, minimums = {}, Counter()
+    for guess, result in guesses.items():
+        revealed = Counter(letter for letter, x in zip(guess, result) if x > 0)
+        for letter, num in revealed.items():
+            minimums[letter] = max(minimums[letter], num)
+        exact.update({i: letter for i, (letter, x) in enumerate(zip(guess, result)) if x == 2})
+    return [word for word in WORDS if all(word[i] == letter for i, letter in exact.items())
+        and all(word.count(letter) >= num for letter, num in minimums.items())]
+
+
+@pytest.mark.parametrize('state', range(len(STATES)))
+def test_word_index_matches_filters(state):
+    knowns = get_knowns(guesses=STATES[state], word_length=5)
+    assert list(WORDS_TABLE[INDEX.mask(knowns=knowns)].index) == list(filter_regex(knowns=knowns, words=WORDS_TABLE).index)
+
+
+@pytest.mark.parametrize('state', range(len(STATES)))
+def test_solver_state_matches_filter_words(state):
+    solver = SolverState(words=WORDS_TABLE, index=INDEX)
+    candidates = solver.set_guesses(guesses=STATES[state])
+    expected = filter_words(guesses=STATES[state], words=WORDS_TABLE, remove_previous_wordle_words=False, index=INDEX)
+    assert list(WORDS_TABLE.index[candidates]) == list(expected.index)
+
+
+def test_solver_state_reuses_prefix():
+    # Changing the last guess gives the same candidates as starting over
+    solver = SolverState(words=WORDS_TABLE, index=INDEX)
+    for guesses in STATES[:20]:
+        assert list(solver.set_guesses(guesses=guesses)) == list(SolverState(words=WORDS_TABLE, index=INDEX).set_guesses(guesses=guesses))
+
+
+@pytest.mark.parametrize('state', range(len(STATES)))
+def test_compiled_knowns(state):
+    guesses = STATES[state]
+    compiled = CompiledKnowns(knowns=get_knowns(guesses=guesses, word_length=5))
+    legal, candidates = compiled.evaluate(index=INDEX)
+    assert list(INDEX.words[legal]) == hard_mode_legal(guesses=guesses)
+    assert list(INDEX.words[candidates]) == consistent_words(guesses=guesses)
+    # Checking only earlier legal guesses gives the same sets
+    rows = np.arange(0, len(WORDS), 2)
+    legal_rows, candidates_rows = compiled.evaluate(index=INDEX, rows=rows)
+    assert list(legal_rows) == list(np.intersect1d(legal, rows)) and list(candidates_rows) == list(np.intersect1d(candidates, rows))
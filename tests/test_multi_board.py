@@ -0,0 +1,62 @@
+import numpy as np
+import os
+from src.helper_methods import MultiBoardState, SolverState, WordIndex, bucket_sizes, compare, load_pattern_matrix, load_words, rank_multi_board
+
+WORDS_TABLE = load_words(path=os.path.join(os.path.dirname(__file__), '..', 'Data-Preprocessed', 'word_freq.csv'))
+WORDS = list(WORDS_TABLE.index)
+INDEX = WordIndex(words=WORDS_TABLE.index)
+PATTERNS = load_pattern_matrix(words=WORDS)
+
+
+def board_elr(guesses: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    # ELR of each guess over one board's candidates, 0 for a solved board
+    if not len(candidates):
+        return np.zeros(len(guesses))
+    sizes = bucket_sizes(patterns=PATTERNS[np.ix_(guesses, candidates)], word_length=5)
+    return 1 - (sizes.astype(np.int64)**2).sum(axis=1) / len(candidates)**2
+
+
+def test_rank_matches_per_board_sum():
+    rng = np.random.default_rng(0)
+    for _ in range(5):
+        boards = [np.sort(rng.choice(len(WORDS), size=rng.integers(1, 60), replace=False)) for _ in range(4)] + [np.zeros(0, dtype=np.int64)]
+        guesses = rng.choice(len(WORDS), size=300, replace=False)
+        ranked, scores = rank_multi_board(patterns=PATTERNS, boards=boards, guesses=guesses)
+        expected = sum(board_elr(guesses=ranked, candidates=candidates) for candidates in boards)
+        assert sorted(ranked) == sorted(guesses)
+        assert np.allclose(scores, expected)
+        assert (np.diff(np.round(scores, 12)) <= 0).all()
+
+
+def test_rank_prefers_candidates_on_ties():
+    # Every guess splits a single candidate the same way, so candidates of some board go first, then earlier positions
+    boards = [np.array([10]), np.array([20])]
+    ranked, _ = rank_multi_board(patterns=PATTERNS, boards=boards, guesses=np.array([5, 20, 3, 10]))
+    assert list(ranked) == [10, 20, 3, 5]
+
+
+def test_solved_board_stops_taking_feedback():
+    answers = ['CIGAR', 'REBUT', 'SISSY']
+    guesses = ['SLATE', 'CIGAR', 'TRUCK']
+    feedback = {guess: [compare(guess=guess, actual=answer) for answer in answers] for guess in guesses}
+    # Feedback given for a board after it was solved is ignored, whatever it is
+    feedback['TRUCK'][0] = [0, 0, 0, 0, 0]
+    state = MultiBoardState(words=WORDS_TABLE, num_boards=3, index=INDEX)
+    candidates = state.set_guesses(guesses=feedback)
+    assert state.solved == [True, False, False]
+    assert len(candidates[0]) == 0
+    assert [guess for guess, _ in state.boards[0].guesses] == ['SLATE', 'CIGAR']
+    for board in [1, 2]:
+        expected = SolverState(words=WORDS_TABLE, index=INDEX).set_guesses(guesses={guess: feedback[guess][board] for guess in guesses})
+        assert list(candidates[board]) == list(expected)
+        assert WORDS.index(answers[board]) in candidates[board]
+
+    # add_guess reaches the same state, and a solved board adds nothing to the ranking
+    incremental = MultiBoardState(words=WORDS_TABLE, num_boards=3, index=INDEX)
+    for guess in guesses:
+        incremental_candidates = incremental.add_guess(guess=guess, results=feedback[guess])
+    assert incremental.solved == state.solved
+    assert all(list(a) == list(b) for a, b in zip(incremental_candidates, candidates))
+    _, scores = rank_multi_board(patterns=PATTERNS, boards=candidates, guesses=np.arange(100))
+    _, unsolved_scores = rank_multi_board(patterns=PATTERNS, boards=candidates[1:], guesses=np.arange(100))
+    assert np.allclose(np.sort(scores), np.sort(unsolved_scores))
@@ -0,0 +1,75 @@
+# Package Imports
+import argparse
+import multiprocessing as mp
+import numpy as np
+import os
+import time
+from collections import Counter
+from benchmark_games import STRATEGIES, init_worker, play, prepare_pattern_matrix
+from src.helper_methods import RESULT_STORE_PATH, SORT_BY_TO_COL_MAP, WORD_TABLE_PATH, ResultStore, SolverState, load_word_data, load_words, rank_suggestions, suggestion_guesses
+
+SORT_BY_OPTIONS = list(SORT_BY_TO_COL_MAP) + ['Expected Information', 'Worst Case']
+
+
+def get_common_states(games: list, num_states: int) -> list:
+    # Game states (guesses made before each guess of each game) seen most often, most common first: [(guesses dict, count), etc.]
+    counts = Counter()
+    for game in games:
+        history = tuple((guess, tuple(result)) for guess, result in game[5])
+        for num_guesses in range(len(history)):
+            counts[history[:num_guesses]] += 1
+    return [({guess: list(result) for guess, result in state}, count) for state, count in counts.most_common(num_states)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fill the result store with suggestions for the game states the simulator (benchmark_games.py) reaches most often.')
+    default_datapath = WORD_TABLE_PATH if os.path.exists(WORD_TABLE_PATH) else 'Data-Preprocessed/word_freq.csv'
+    parser.add_argument('--datapath', default=default_datapath, help=f'Words table, .csv or packed .bin; use the one the app loads. (Defaults to {default_datapath})')
+    parser.add_argument('--strategy', default='entropy', choices=list(STRATEGIES), help='Strategy played by the simulator. (Defaults to entropy)')
+    parser.add_argument('--states', type=int, default=1000, help='Number of most common game states to store. (Defaults to 1000)')
+    parser.add_argument('--sort-by', action='append', choices=SORT_BY_OPTIONS, help='Suggestion order to store, can be given more than once. (Defaults to all)')
+    parser.add_argument('--store', default=RESULT_STORE_PATH, help=f'Result store file. (Defaults to {RESULT_STORE_PATH})')
+    parser.add_argument('--processes', type=int, default=mp.cpu_count(), help='Worker processes for the simulator. (Defaults to number of cores)')
+    parser.add_argument('--cache-mb', type=float, default=64, help='Memory limit of each simulator process\'s candidate subset cache in MB. (Defaults to 64)')
+    args = parser.parse_args()
+    sort_by_options = args.sort_by or SORT_BY_OPTIONS
+    times = {}
+    start = time.perf_counter()
+
+    # Simulate every answer
+    tasks = [(answer, args.strategy, 'candidates') for answer in load_words(path=args.datapath).index]
+    prepare_pattern_matrix(datapath=args.datapath)
+    with mp.Pool(processes=args.processes, initializer=init_worker, initargs=(args.datapath, args.cache_mb)) as pool:
+        games = list(pool.imap_unordered(play, tasks, chunksize=16))
+    states = get_common_states(games=games, num_states=args.states)
+    print(f'Games: {len(games)}\nStates: {len(states)} (seen {states[-1][1]} to {states[0][1]} times)')
+    times['simulate'] = time.perf_counter() - start
+    stage_start = time.perf_counter()
+
+    # Compute and store suggestions with the app's default options
+    words = load_word_data(datapath=args.datapath)
+    solver = SolverState(words=words['data'], index=words['index'])
+    store = ResultStore(path=args.store)
+    entries = []
+    for guesses, _ in states:
+        candidates = solver.set_guesses(guesses=guesses) if guesses else np.arange(len(words['data']))
+        for sort_by in sort_by_options:
+            key = ResultStore.key(guesses=guesses, remove_previous_words=False, sort_by=sort_by, data_version=words['version'],
+                options={'scoreAllWords': False, 'hardMode': False})
+            suggestions = list(rank_suggestions(words=words, candidates=candidates, sort_by=sort_by, guesses=suggestion_guesses(words=words, guesses=guesses)))
+            entries.append((key, suggestions, len(candidates)))
+    times['compute'] = time.perf_counter() - stage_start
+    stage_start = time.perf_counter()
+    store.put_many(entries=entries)
+    times['store'] = time.perf_counter() - stage_start
+
+    # Lookup latency of the stored states
+    for key, _, _ in entries:
+        store.get(key=key)
+    print(f'Stored: {len(entries)} results ({len(store)} entries in {args.store})')
+    print(f'Compute: {times["compute"]*1000/max(len(entries), 1):.3f} ms/result\nStore Lookup: {store.stats()}')
+    print(f'Times: {times}')
+    return
+
+if __name__=='__main__':
+    main()